@@ -0,0 +1,58 @@
+import argparse
+import random
+import time
+
+from benchmarks.bench_memory import RecordingConnection
+from common.common import set_debug
+from connection.common import LENGTH_PREFIX
+from game.gameserver import Game
+from game.messages.codec import Codec, TEXT, BINARY
+from game.messages.commands import Command
+from game.messages.common import CoupMessage
+from game.messages.responses import Response
+from tests.mocks.random_logic import QuietRandomLogic
+
+
+def record_games(games: int, seed: int) -> list[CoupMessage]:
+    set_debug(False)
+    random.seed(seed)
+    recorded: list[CoupMessage] = []
+    game = Game([RecordingConnection(QuietRandomLogic(), recorded) for _ in range(4)], rng=seed)
+    game.run_match(games)
+    return [m for m in recorded if m is not None]
+
+
+def fresh(messages: list[CoupMessage]) -> list[CoupMessage]:
+    # Copies without the text serialization memo, so that every round encodes from scratch
+    return [BINARY.decode(BINARY.encode(m), type(m)) for m in messages]
+
+
+def throughput(codec: Codec, messages: list[CoupMessage], rounds: int) -> tuple[float, float]:
+    # Best of the rounds, in messages per second
+    kinds = [Command if isinstance(m, Command) else Response for m in messages]
+    encode_seconds = decode_seconds = float("inf")
+    for _ in range(rounds):
+        copies = fresh(messages)
+        start = time.perf_counter()
+        encoded = [codec.encode(m) for m in copies]
+        encode_seconds = min(encode_seconds, time.perf_counter() - start)
+        start = time.perf_counter()
+        for data, kind in zip(encoded, kinds):
+            codec.decode(data, kind)
+        decode_seconds = min(decode_seconds, time.perf_counter() - start)
+    return len(messages) / encode_seconds, len(messages) / decode_seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    messages = record_games(args.games, seed=1)
+    print(f"{len(messages) / args.games:.0f} messages per game")
+    for name, codec in [("text", TEXT), ("binary", BINARY)]:
+        encode, decode = throughput(codec, messages, args.rounds)
+        bytes_per_game = sum(LENGTH_PREFIX.size + len(codec.encode(m)) for m in messages) / args.games
+        print(f"{name:7} encode {encode:10.0f} messages/s, decode {decode:10.0f} messages/s, "
+              f"{bytes_per_game:7.0f} bytes per game with length prefixes")
@@ -0,0 +1,46 @@
+import timeit
+
+from config import PARAM_SPLITTER, COMMAND_END
+from game.enums.actions import Assassinate
+from game.enums.cards import Contessa
+from game.messages.commands import *
+from game.messages.responses import *
+
+MESSAGES: list[tuple[type[ParseSubclassNameParameters], str]] = [
+    (Command, AddCard(Contessa()).serialize()),
+    (Command, MoneyChanged(1, -3).serialize()),
+    (Command, BlockWasChallenged(Assassinate(), 0, 1, Contessa(), 1, 0, True).serialize()),
+    (Response, IncomeDecision().serialize()),
+    (Response, CardResponse(Contessa()).serialize()),
+    (Response, AmbassadorCardResponse(Contessa(), Contessa()).serialize()),
+]
+
+
+def linear_scan_deserialize(cls: type[ParseSubclassNameParameters], serialized: str):
+    # The subclass tree walk that deserialize did before the name registry
+    split = serialized.strip(COMMAND_END).split(PARAM_SPLITTER)
+    for sub in cls.transitive_named_subclasses():
+        if sub.message_name == split[0]:
+            try:
+                return sub.parse_from_params(split[1:])
+            except (IndexError, ValueError):
+                return None
+
+
+def run_all(deserialize):
+    for cls, serialized in MESSAGES:
+        deserialize(cls, serialized)
+
+
+def messages_per_second(deserialize, rounds: int) -> float:
+    seconds = timeit.timeit(lambda: run_all(deserialize), number=rounds)
+    return rounds * len(MESSAGES) / seconds
+
+
+if __name__ == "__main__":
+    rounds = 20000
+    before = messages_per_second(linear_scan_deserialize, rounds)
+    after = messages_per_second(lambda cls, s: cls.deserialize(s), rounds)
+    print(f"Subclass walk:  {before:12.0f} messages/s")
+    print(f"Name registry:  {after:12.0f} messages/s")
+    print(f"Speedup:        {after / before:12.1f}x")
@@ -0,0 +1,61 @@
+import timeit
+
+from common.common import set_debug
+from game.enums.actions import Assassinate, Steal
+from game.enums.cards import Captain, Contessa
+from game.gameclient import PlayerClient
+from game.messages.commands import *
+from game.simulate import NullConnection
+from tests.mocks.null_logic import NullLogic
+
+# Shutdown and RemoveCard are left out, as they can not be repeated on the same client
+COMMANDS: list[Command] = [
+    DebugMessage("hello"),
+    AskName(),
+    AddOpponent(1, "opponent"),
+    SetPlayerNumber(0),
+    NewGame(),
+    AddCard(Contessa()),
+    ChangeMoney(1),
+    PlayerLostACard(1, Captain()),
+    MoneyChanged(1, 2),
+    TimeBankLeft(1000),
+    PlayerViolatedRules(2),
+    ChooseCardToKill(),
+    ChooseAmbassadorCardsToRemove(),
+    TakeTurn(),
+    YourActionIsChallenged(Steal(), 1, 1),
+    YourBlockIsChallenged(Steal(), 1, Captain(), 1),
+    DoYouBlock(Steal(), 1),
+    DoYouChallengeAction(Steal(), 1, 0),
+    DoYouChallengeBlock(Steal(), 0, 1, Captain(), 1),
+    ActionWasTaken(Steal(), 1, 0),
+    ActionWasBlocked(Steal(), 1, 0, Captain(), 0),
+    ActionWasChallenged(Assassinate(), 1, 0, 0, True),
+    BlockWasChallenged(Assassinate(), 0, 1, Contessa(), 1, 0, True),
+]
+
+# The handled types in the order the isinstance chain checked them
+CHAIN = list(PlayerClient.HANDLERS)
+
+
+def isinstance_chain(client: PlayerClient, command: Command):
+    # Approximates the isinstance chain run_command had before the handler table
+    for command_type in CHAIN:
+        if isinstance(command, command_type):
+            return client._handlers[command_type](command)
+
+
+def nanoseconds_per_call(function, rounds: int) -> float:
+    return timeit.timeit(function, number=rounds) / rounds * 1e9
+
+
+if __name__ == "__main__":
+    set_debug(False)
+    rounds = 100000
+    client = PlayerClient(NullConnection(), NullLogic())
+    print(f"{'Command':32} {'isinstance chain':>18} {'handler table':>15}")
+    for command in COMMANDS:
+        before = nanoseconds_per_call(lambda: isinstance_chain(client, command), rounds)
+        after = nanoseconds_per_call(lambda: client.run_command(command), rounds)
+        print(f"{type(command).__name__:32} {before:15.0f} ns {after:12.0f} ns")
@@ -0,0 +1,37 @@
+import argparse
+import socket
+import threading
+import time
+
+from connection.common import OpenSocket
+from game.messages.commands import Command, MoneyChanged
+
+
+def throughput(length_prefixed: bool, amount: int) -> float:
+    # Messages per second sent one by one over a local socket pair, as the server sends notifications
+    server_sock, client_sock = socket.socketpair()
+    sender, receiver = OpenSocket(server_sock, length_prefixed), OpenSocket(client_sock, length_prefixed)
+
+    def send_all():
+        for i in range(amount):
+            sender.send(MoneyChanged(i % 6, i))
+
+    start = time.perf_counter()
+    sending = threading.Thread(target=send_all)
+    sending.start()
+    for _ in range(amount):
+        Command.deserialize(receiver.receive())
+    sending.join()
+    elapsed = time.perf_counter() - start
+    server_sock.close()
+    client_sock.close()
+    return amount / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=100000)
+    args = parser.parse_args()
+
+    for name, length_prefixed in [("legacy", False), ("length-prefixed", True)]:
+        print(f"{name:15} {throughput(length_prefixed, args.messages):9.0f} messages/s")
@@ -0,0 +1,46 @@
+import argparse
+import asyncio
+import contextlib
+import os
+import statistics
+import threading
+import time
+
+from connection.common import OpenSocket
+from game.gameclient import PlayerClient
+from game.lobby import Lobby
+from tests.mocks.random_logic import RandomLogic
+
+
+def run_client(port: int):
+    PlayerClient(OpenSocket.new("localhost", port), RandomLogic(0)).run()
+
+
+async def load_test(tables: int, table_size: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    lobby = Lobby(table_size, max_tables=tables, latency_sink=latencies.append)
+    serving = asyncio.create_task(lobby.serve("localhost", 0, tables))
+    await lobby.started.wait()
+
+    start = time.perf_counter()
+    clients = [threading.Thread(target=run_client, args=(lobby.port,)) for _ in range(tables * table_size)]
+    for c in clients:
+        c.start()
+    await serving
+    elapsed = time.perf_counter() - start
+    for c in clients:
+        await asyncio.to_thread(c.join)
+    return tables / elapsed, latencies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--players", type=int, default=2)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        games_per_second, latencies = asyncio.run(load_test(args.tables, args.players))
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(f"{args.tables} tables of {args.players}: {games_per_second:.1f} games/s, "
+          f"p99 decision latency {p99 * 1000:.2f} ms over {len(latencies)} decisions")
@@ -0,0 +1,113 @@
+import argparse
+import random
+import tracemalloc
+from collections.abc import Callable
+
+from common.common import set_debug
+from game.enums.actions import Assassinate, Steal
+from game.enums.cards import Captain, Contessa
+from game.gameserver import Game
+from game.messages.commands import *
+from game.messages.common import CoupMessage
+from game.messages.responses import *
+from game.simulate import DirectConnection
+from tests.mocks.random_logic import QuietRandomLogic
+
+MESSAGES: list[Callable[[], CoupMessage]] = [
+    lambda: AddCard(Contessa()),
+    lambda: MoneyChanged(1, -3),
+    lambda: DoYouChallengeAction(Steal(), 0, 1),
+    lambda: BlockWasChallenged(Assassinate(), 0, 1, Contessa(), 1, 0, True),
+    lambda: TakeTurn(),
+    lambda: StealDecision(1),
+    lambda: Block(Captain()),
+]
+
+
+_unslotted: dict[type, type] = {}
+
+
+def dict_backed(message: CoupMessage) -> CoupMessage:
+    # The same message as an instance of a subclass without __slots__, as the messages were before
+    cls = type(message)
+    if cls not in _unslotted:
+        _unslotted[cls] = type(cls.__name__, (cls,), {})
+    copy = object.__new__(_unslotted[cls])
+    for cls in type(message).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if hasattr(message, name):
+                setattr(copy, name, getattr(message, name))
+    copy.__dict__  # Reading it makes the instance keep a real dict, as the old serialize did
+    return copy
+
+
+def measure(make, amount: int) -> tuple[float, float]:
+    # Bytes and allocated blocks per object that stays alive
+    make()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [make() for _ in range(amount)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in diff)
+    blocks = sum(stat.count_diff for stat in diff)
+    del kept
+    return size / amount, blocks / amount
+
+
+class RecordingConnection(DirectConnection):
+    # Keeps every message of the game alive, like a replay buffer would
+    def __init__(self, logic, recorded: list[CoupMessage]):
+        super().__init__(logic)
+        self.recorded = recorded
+
+    def send(self, msg: CoupMessage):
+        self.recorded.append(msg)
+        super().send(msg)
+
+    def send_and_receive_response[R](self, msg: CoupMessage, response_type: type[R]) -> R | None:
+        response = super().send_and_receive_response(msg, response_type)
+        self.recorded += [msg, response]
+        return response
+
+
+def measure_games(games: int, seed: int) -> tuple[float, float, float]:
+    # Peak traced memory per game, and bytes and blocks kept by the messages of one game
+    set_debug(False)
+    random.seed(seed)
+    recorded: list[CoupMessage] = []
+    game = Game([RecordingConnection(QuietRandomLogic(), recorded) for _ in range(4)], rng=seed)
+    peak = kept_size = kept_blocks = 0
+    for i in range(games):
+        recorded.clear()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        if i:
+            game.new_game(starting_seat=i)
+        game.play_game()
+        after = tracemalloc.take_snapshot()
+        peak += tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        diff = after.compare_to(before, "filename")
+        kept_size += sum(stat.size_diff for stat in diff)
+        kept_blocks += sum(stat.count_diff for stat in diff)
+    game.shutdown_players()
+    return peak / games, kept_size / games, kept_blocks / games
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--objects", type=int, default=20000)
+    parser.add_argument("--games", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'Message':24} {'dict-backed':>24} {'slotted':>24}")
+    for make in MESSAGES:
+        name = type(make()).__name__
+        dict_size, dict_blocks = measure(lambda: dict_backed(make()), args.objects)
+        slot_size, slot_blocks = measure(make, args.objects)
+        print(f"{name:24} {dict_size:7.0f} B {dict_blocks:5.1f} blocks    {slot_size:7.0f} B {slot_blocks:5.1f} blocks")
+
+    peak, kept_size, kept_blocks = measure_games(args.games, seed=1)
+    print(f"Per game: peak {peak / 1024:.1f} KiB, messages keep {kept_size / 1024:.1f} KiB in {kept_blocks:.0f} blocks")
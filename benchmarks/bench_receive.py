@@ -0,0 +1,83 @@
+import argparse
+import socket
+import threading
+import time
+import tracemalloc
+
+from connection.common import OpenSocket, LENGTH_PREFIX
+from game.messages.codec import Codec, TEXT, BINARY
+from game.messages.commands import Command, MoneyChanged, BlockWasChallenged
+from game.enums.actions import Assassinate
+from game.enums.cards import Contessa
+
+
+class CopyingOpenSocket(OpenSocket):
+    # The receive path before the reusable buffer: recv into new bytes, append, copy the message out and shift
+    def __init__(self, connection, length_prefixed: bool = False):
+        super().__init__(connection, length_prefixed)
+        self._pending = bytearray()
+
+    def _fill_pending(self) -> bool:
+        data = self.connection.recv(4096)
+        self._pending.extend(data)
+        return len(data) > 0
+
+    def receive_frame(self) -> bytes:
+        while len(self._pending) < LENGTH_PREFIX.size:
+            if not self._fill_pending():
+                return b""
+        (length,) = LENGTH_PREFIX.unpack_from(self._pending)
+        end = LENGTH_PREFIX.size + length
+        while len(self._pending) < end:
+            if not self._fill_pending():
+                return b""
+        data = bytes(self._pending[LENGTH_PREFIX.size:end])
+        del self._pending[:end]
+        return data
+
+    def receive_message[M](self, message_type: type[M]) -> M | None:
+        return self.codec.decode(self.receive_frame(), message_type)
+
+
+def run(receiver_type: type[OpenSocket], codec: Codec, amount: int, traced: bool) -> float:
+    # Receiver CPU seconds per message, or with traced, the peak of memory allocated while receiving one message
+    server_sock, client_sock = socket.socketpair()
+    sender, receiver = OpenSocket(server_sock, True), receiver_type(client_sock, True)
+    sender.codec = receiver.codec = codec
+    messages = [MoneyChanged(1, -3), BlockWasChallenged(Assassinate(), 0, 1, Contessa(), 1, 2, True)] * 50
+
+    def send_all():
+        for _ in range(amount // len(messages)):
+            sender.send_many(messages)
+
+    sending = threading.Thread(target=send_all)
+    sending.start()
+    peak = 0
+    start = time.thread_time()
+    for _ in range(amount // len(messages) * len(messages)):
+        if traced:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        receiver.receive_message(Command)
+        if traced:
+            peak += tracemalloc.get_traced_memory()[1] - base
+    elapsed = time.thread_time() - start
+    sending.join()
+    server_sock.close()
+    client_sock.close()
+    return (peak if traced else elapsed) / amount
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=200000)
+    args = parser.parse_args()
+
+    for name, codec in [("text", TEXT), ("binary", BINARY)]:
+        for receiver_type in [CopyingOpenSocket, OpenSocket]:
+            cpu = run(receiver_type, codec, args.messages, traced=False)
+            tracemalloc.start()
+            allocated = run(receiver_type, codec, args.messages // 10, traced=True)
+            tracemalloc.stop()
+            print(f"{name:7} {receiver_type.__name__:18} {cpu * 1e9:6.0f} ns CPU, "
+                  f"{allocated:5.0f} B peak allocation per message")
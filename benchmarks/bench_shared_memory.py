@@ -0,0 +1,78 @@
+import argparse
+import multiprocessing
+import os
+import socket
+import statistics
+import tempfile
+import time
+
+from benchmarks.bench_transports import round_trips
+from common.common import set_debug
+from config import FRAMING_HANDSHAKE_TIMEOUT
+from connection.address import listen, connect, parse_address
+from connection.common import Connection, OpenSocket
+from connection.sharedmemory import SharedMemoryConnection
+from game.gameclient import PlayerClient
+from game.messages.commands import AskName
+from game.messages.responses import NameResponse
+from tests.mocks.null_logic import NullLogic
+
+
+def run_bot(address: str):
+    set_debug(False)
+    PlayerClient(connect(address), NullLogic()).run()
+
+
+def bot_process(address: str) -> Connection:
+    # Server end of a connection to a bot in its own process, so that the two sides do not share the GIL
+    scheme, _ = parse_address(address)
+    server = listen(address)
+    if scheme == "tcp":
+        # Port 0 picks a free port
+        address = "tcp://{}:{}".format(*server.getsockname())
+    multiprocessing.Process(target=run_bot, args=(address,)).start()
+    sock, _ = server.accept()
+    server.close()
+    if scheme == "shm":
+        return SharedMemoryConnection.accept(sock, FRAMING_HANDSHAKE_TIMEOUT)
+    if scheme == "tcp":
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    connection = OpenSocket(sock)
+    connection.accept_length_prefix(FRAMING_HANDSHAKE_TIMEOUT)
+    return connection
+
+
+def messages_per_second(connection: Connection, amount: int, batch: int) -> float:
+    # Requests are written in batches, and all answers of a batch are read before the next one, like the server does
+    # with concurrent queries. Both the requests and the responses are counted.
+    start = time.perf_counter()
+    for _ in range(amount // batch):
+        connection.send_many([AskName()] * batch)
+        for _ in range(batch):
+            connection.receive_message(NameResponse)
+    return 2 * (amount // batch) * batch / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--round-trips", type=int, default=20000)
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=50)
+    args = parser.parse_args()
+    set_debug(False)
+
+    with tempfile.TemporaryDirectory() as directory:
+        transports = [
+            ("tcp loopback", "tcp://localhost:0"),
+            ("unix socket", f"unix://{os.path.join(directory, 'unix.sock')}"),
+            ("shared memory", f"shm://{os.path.join(directory, 'shm.sock')}"),
+        ]
+        for name, address in transports:
+            connection = bot_process(address)
+            rate = messages_per_second(connection, args.messages, args.batch)
+            # round_trips ends the bot with Shutdown
+            latencies = round_trips(connection, args.round_trips)
+            p99 = statistics.quantiles(latencies, n=100)[98]
+            print(f"{name:13} {rate:9.0f} messages/s, round trip median {statistics.median(latencies) * 1e6:6.1f} us, "
+                  f"p99 {p99 * 1e6:6.1f} us")
+            connection.close()
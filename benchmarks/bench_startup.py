@@ -0,0 +1,106 @@
+import argparse
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+
+from common.common import set_debug
+from connection.address import listen, connect
+from connection.common import Connection, OpenSocket
+from connection.server import get_connections
+from game.gameclient import PlayerClient
+from game.gameserver import Game
+from game.messages.commands import AskName, SetPlayerNumber
+from game.messages.responses import NameResponse
+from tests.mocks.null_logic import NullLogic
+
+
+class SlowNameLogic(NullLogic):
+    # Takes its time to answer the name, like a bot that loads a model on start
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def ask_name(self) -> str:
+        time.sleep(self.delay)
+        return "slow"
+
+
+def sequential_connections(amount: int, address: str, framing_timeout: float,
+                           started: threading.Event) -> list[Connection]:
+    # get_connections as it was, accepting and negotiating with one client at a time
+    sock = listen(address)
+    started.set()
+    connections = []
+    while len(connections) < amount:
+        connect_sock, _ = sock.accept()
+        connection = OpenSocket(connect_sock)
+        connection.accept_length_prefix(framing_timeout)
+        connections.append(connection)
+    sock.close()
+    return connections
+
+
+def sequential_names(connections: list[Connection]):
+    # The handshake of Game.__init__ as it was, asking the players one by one
+    for number, connection in enumerate(connections):
+        connection.send(SetPlayerNumber(number))
+        connection.send_and_receive_response(AskName(), NameResponse)
+
+
+def concurrent_names(connections: list[Connection]):
+    Game(connections)
+
+
+def start_table(address: str, delays: list[float], legacy: int, framing_timeout: float,
+                accept: Callable[[int, str, float, threading.Event], list[Connection]],
+                name: Callable[[list[Connection]], None]) -> float:
+    # Seconds from the first client connecting to every player being named. The bots connect at once, the legacy
+    # ones without a hello and first, as that is when they hold up the others the most.
+    def run_bot(delay: float, length_prefixed: bool):
+        PlayerClient(connect(address, length_prefixed), SlowNameLogic(delay)).run()
+
+    bots = [threading.Thread(target=run_bot, args=(0, False)) for _ in range(legacy)]
+    bots += [threading.Thread(target=run_bot, args=(delay, True)) for delay in delays]
+    connections = []
+    started = threading.Event()
+    accepting = threading.Thread(target=lambda: connections.extend(accept(len(bots), address, framing_timeout,
+                                                                          started)))
+    accepting.start()
+    started.wait()
+
+    start = time.perf_counter()
+    for bot in bots:
+        bot.start()
+    accepting.join()
+    name(connections)
+    elapsed = time.perf_counter() - start
+    for connection in connections:
+        connection.close()
+    for bot in bots:
+        bot.join()
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--slow", type=int, default=3, help="Players that take --delay seconds to give their name")
+    parser.add_argument("--delay", type=float, default=0.2)
+    parser.add_argument("--legacy", type=int, default=2, help="Players that do not ask for length-prefixed framing")
+    parser.add_argument("--framing-timeout", type=float, default=0.1)
+    args = parser.parse_args()
+    set_debug(False)
+
+    delays = [args.delay] * args.slow + [0.0] * (args.players - args.slow - args.legacy)
+    stages = [
+        ("sequential", sequential_connections, sequential_names),
+        ("concurrent", get_connections, concurrent_names),
+    ]
+    print(f"{args.players} players, {args.slow} of them {args.delay} s slow to name themselves, "
+          f"{args.legacy} legacy with a {args.framing_timeout} s framing timeout")
+    with tempfile.TemporaryDirectory() as directory:
+        address = f"unix://{os.path.join(directory, 'bench.sock')}"
+        for label, accept, name in stages:
+            elapsed = start_table(address, delays, args.legacy, args.framing_timeout, accept, name)
+            print(f"{label:10} start-up {elapsed * 1000:7.1f} ms")
@@ -0,0 +1,19 @@
+import argparse
+import time
+
+from game.tournament import run_tournament
+
+LOGICS = ["tests.mocks.random_logic:QuietRandomLogic"] * 4
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=8000)
+    args = parser.parse_args()
+
+    base = None
+    for workers in [1, 2, 4, 8]:
+        start = time.perf_counter()
+        result = run_tournament(LOGICS, args.games, workers, seed=1)
+        games_per_second = result.games / (time.perf_counter() - start)
+        base = base or games_per_second
+        print(f"{workers} workers: {games_per_second:8.0f} games/s, speedup {games_per_second / base:.2f}x")
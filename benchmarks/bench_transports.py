@@ -0,0 +1,68 @@
+import argparse
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+from common.common import set_debug
+from connection.address import listen, connect
+from connection.channel import ChannelConnection
+from connection.common import Connection, OpenSocket
+from game.gameclient import PlayerClient
+from game.messages.commands import AskName, Shutdown
+from game.messages.responses import NameResponse
+from tests.mocks.null_logic import NullLogic
+
+
+def socket_pair(address: str) -> Connection:
+    # Server end of a connection to a bot running in a thread, as get_connections would accept it
+    server = listen(address)
+    if server.family != socket.AF_UNIX:
+        # Port 0 picks a free port
+        address = "tcp://{}:{}".format(*server.getsockname())
+    client = threading.Thread(target=lambda: PlayerClient(connect(address), NullLogic()).run())
+    client.start()
+    sock, _ = server.accept()
+    server.close()
+    if sock.family != socket.AF_UNIX:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    connection = OpenSocket(sock)
+    connection.accept_length_prefix(1)
+    return connection
+
+
+def channel_pair() -> Connection:
+    server_end, client_end = ChannelConnection.pair()
+    threading.Thread(target=PlayerClient(client_end, NullLogic()).run).start()
+    return server_end
+
+
+def round_trips(connection: Connection, amount: int) -> list[float]:
+    latencies = []
+    for _ in range(amount):
+        start = time.perf_counter()
+        connection.send_and_receive_response(AskName(), NameResponse)
+        latencies.append(time.perf_counter() - start)
+    connection.send(Shutdown())
+    return latencies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--round-trips", type=int, default=20000)
+    args = parser.parse_args()
+    set_debug(False)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.sock")
+        transports = [
+            ("tcp loopback", lambda: socket_pair("tcp://localhost:0")),
+            ("unix socket", lambda: socket_pair(f"unix://{path}")),
+            ("in-memory", channel_pair),
+        ]
+        for name, make in transports:
+            latencies = round_trips(make(), args.round_trips)
+            p99 = statistics.quantiles(latencies, n=100)[98]
+            print(f"{name:13} median {statistics.median(latencies) * 1e6:7.1f} us, p99 {p99 * 1e6:7.1f} us")
@@ -1,10 +1,55 @@
-from config import HOST, PORT
-from connection.common import OpenSocket
-from game.gameclient import PlayerClient
-from game.logic.clients import ExtremelySimpleTestClient
+import argparse
+import asyncio
+import os
+import threading
 
-if __name__ == "__main__":
-    connection = OpenSocket.new(HOST, PORT)
-    logic = ExtremelySimpleTestClient()
-    client = PlayerClient(connection, logic)
+from connection.address import DEFAULT_ADDRESS, connect, connect_async
+from game.gameclient import PlayerClient, AsyncPlayerClient
+from game.logic.clients import ClientLogic
+from game.logic.loader import load_logic_class
+from game.messages.codec import Codec, TEXT, BINARY
+
+DEFAULT_LOGIC = "game.logic.clients:ExtremelySimpleTestClient"
+
+
+def run_bot(logic_class: type[ClientLogic], address: str, codec: Codec = TEXT):
+    connection = connect(address, codec=codec)
+    client = PlayerClient(connection, logic_class())
     client.run()
+
+
+async def run_bots_async(logic_class: type[ClientLogic], address: str, instances: int, codec: Codec = TEXT):
+    async def run_async_bot():
+        connection = await connect_async(address, codec=codec)
+        await AsyncPlayerClient(connection, logic_class()).run()
+
+    await asyncio.gather(*[run_async_bot() for _ in range(instances)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("logic", nargs="?", default=os.environ.get("COUP_LOGIC", DEFAULT_LOGIC),
+                        metavar="module:Class", help="Logic class to play with. Defaults to $COUP_LOGIC.")
+    parser.add_argument("-n", "--instances", type=int, default=int(os.environ.get("COUP_INSTANCES", 1)),
+                        help="Amount of players to run in this process, each with its own connection. "
+                             "Defaults to $COUP_INSTANCES.")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Run all instances on one event loop instead of a thread each.")
+    parser.add_argument("--binary", action="store_true",
+                        help="Ask the server for the compact binary protocol instead of the text one.")
+    parser.add_argument("--address", default=DEFAULT_ADDRESS, help="tcp://host:port, unix:///path/to/socket or shm:///path/to/socket")
+    args = parser.parse_args()
+
+    logic_class = load_logic_class(args.logic)
+    codec = BINARY if args.binary else TEXT
+    if args.use_async:
+        asyncio.run(run_bots_async(logic_class, args.address, args.instances, codec))
+    elif args.instances == 1:
+        run_bot(logic_class, args.address, codec)
+    else:
+        bots = [threading.Thread(target=run_bot, args=(logic_class, args.address, codec))
+                for _ in range(args.instances)]
+        for bot in bots:
+            bot.start()
+        for bot in bots:
+            bot.join()
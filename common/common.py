@@ -1,6 +1,37 @@
-from config import DEBUG
+import logging
+import sys
+
+import config
+
+# Loggers per subsystem. Messages are given %-style arguments, e.g. server_log.debug("Player %s is dead", number),
+# so nothing is formatted unless the level is enabled. A disabled level costs only the logger's cached level check.
+server_log = logging.getLogger("coup.server")
+client_log = logging.getLogger("coup.client")
+protocol_log = logging.getLogger("coup.protocol")
+
+
+def configure_logging(debug: bool | None = None, levels: dict[str, str] | None = None):
+    # Levels come from config.LOG_LEVELS by subsystem name. With debug off, only warnings and errors are shown.
+    debug = config.DEBUG if debug is None else debug
+    levels = config.LOG_LEVELS if levels is None else levels
+    root = logging.getLogger("coup")
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        root.addHandler(handler)
+        root.propagate = False
+    for subsystem, level in levels.items():
+        logging.getLogger(f"coup.{subsystem}").setLevel(level if debug else logging.WARNING)
+
+
+def set_debug(enabled: bool):
+    config.DEBUG = enabled
+    configure_logging(enabled)
 
 
 def debug_print(msg):
-    if DEBUG:
+    if config.DEBUG:
         print(msg)
+
+
+configure_logging()
@@ -1,6 +1,8 @@
 # Values to change
 
 DEBUG = True
+# Log levels by subsystem when DEBUG is on. "protocol" logs every raw message, which is a lot.
+LOG_LEVELS = {"server": "DEBUG", "client": "DEBUG", "protocol": "DEBUG"}
 HOST = "localhost"
 PORT = 5000
 PLAYER_AMOUNT = 2
@@ -9,6 +11,17 @@ WRONG_MESSAGE_TOLERANCE = 3
 GAMES_AMOUNT = 1
 START_MONEY = 2
 START_CARDS_AMOUNT = 2
+# Seconds the server waits for a connecting client to ask for length-prefixed framing
+FRAMING_HANDSHAKE_TIMEOUT = 0.5
+# Seconds a player may take to answer one request
+DECISION_TIMEOUT = 10
+# Seconds the players together have to give their names at the start of a match. Everyone is asked at once, and the
+# players who have not answered by then are left out.
+HANDSHAKE_TIMEOUT = 10
+# Seconds a player may spend answering requests during one game, or None for no limit. Running out kills the player.
+TIME_BANK = None
+# Ask block and challenge questions from all players at once instead of one by one
+CONCURRENT_QUERIES = False
 
 # Constants to not change (unless needed)
 PARAM_SPLITTER = "^"
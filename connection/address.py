@@ -0,0 +1,77 @@
+import asyncio
+import os
+import socket
+from urllib.parse import urlsplit
+
+from config import HOST, PORT
+from connection.asynchronous import AsyncOpenSocket
+from connection.common import OpenSocket
+from connection.sharedmemory import SharedMemoryConnection
+from game.messages.codec import Codec, TEXT
+
+# Addresses are tcp://host:port, unix:///path/to/socket, shm:///path/to/socket for shared memory rings set up over
+# that unix socket, or mem:// for in-memory channels within one process
+DEFAULT_ADDRESS = f"tcp://{HOST}:{PORT}"
+SCHEMES = ("tcp", "unix", "shm", "mem")
+
+
+def parse_address(address: str) -> tuple[str, str | tuple[str, int] | None]:
+    # Scheme, and the host and port or the socket path
+    parts = urlsplit(address)
+    if parts.scheme == "tcp":
+        if parts.hostname is None or parts.port is None:
+            raise ValueError(f"TCP address {address} needs a host and a port")
+        return "tcp", (parts.hostname, parts.port)
+    if parts.scheme in ("unix", "shm"):
+        # Both unix:///absolute/path and unix://relative/path work
+        path = parts.netloc + parts.path
+        if not path:
+            raise ValueError(f"Unix socket address {address} needs a path")
+        return parts.scheme, path
+    if parts.scheme == "mem":
+        return "mem", None
+    raise ValueError(f"Unknown address {address}, expected one of {', '.join(s + '://' for s in SCHEMES)}")
+
+
+def listen(address: str) -> socket.socket:
+    scheme, target = parse_address(address)
+    if scheme == "tcp":
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Connections of the previous match may still be in TIME_WAIT
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    elif scheme in ("unix", "shm"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # A socket file left over from an earlier server would make bind fail
+        if os.path.exists(target):
+            os.unlink(target)
+    else:
+        raise ValueError(f"Can not listen on {address}, in-memory channels are made with ChannelConnection.pair")
+    sock.bind(target)
+    sock.listen()
+    return sock
+
+
+def connect(address: str, length_prefixed: bool = True, codec: Codec = TEXT) -> OpenSocket | SharedMemoryConnection:
+    scheme, target = parse_address(address)
+    if scheme == "tcp":
+        return OpenSocket.new(target[0], target[1], length_prefixed, codec)
+    if scheme == "unix":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(target)
+        return OpenSocket.wrap(sock, length_prefixed, codec)
+    if scheme == "shm":
+        # Rings are always framed
+        return SharedMemoryConnection.connect(target, codec)
+    raise ValueError(f"Can not connect to {address} from another process")
+
+
+async def connect_async(address: str, length_prefixed: bool = True, codec: Codec = TEXT) -> AsyncOpenSocket:
+    scheme, target = parse_address(address)
+    if scheme == "tcp":
+        return await AsyncOpenSocket.new(target[0], target[1], length_prefixed, codec)
+    if scheme == "unix":
+        reader, writer = await asyncio.open_unix_connection(target)
+        return await AsyncOpenSocket.wrap(reader, writer, length_prefixed, codec)
+    if scheme == "shm":
+        raise ValueError(f"Shared memory connections can not be used with asyncio, use unix://{target} instead")
+    raise ValueError(f"Can not connect to {address} from another process")
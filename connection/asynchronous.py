@@ -0,0 +1,213 @@
+import asyncio
+import time
+from abc import abstractmethod
+from collections.abc import Callable, Coroutine
+
+from config import COMMAND_END
+from connection.common import Connection, LENGTH_PREFIX_HELLO, LENGTH_PREFIX
+from game.messages.codec import Codec, TEXT, CODECS
+from game.messages.common import CoupMessage
+
+
+class AsyncConnection:
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    codec: Codec = TEXT
+
+    @abstractmethod
+    async def send(self, msg: CoupMessage):
+        raise NotImplementedError()
+
+    async def send_many(self, msgs: list[CoupMessage]):
+        for msg in msgs:
+            await self.send(msg)
+
+    @abstractmethod
+    async def receive_frame(self) -> bytes:
+        raise NotImplementedError()
+
+    async def receive(self) -> str:
+        return (await self.receive_frame()).decode("UTF-8")
+
+    async def send_and_receive(self, msg: CoupMessage) -> str:
+        await self.send(msg)
+        return await self.receive()
+
+    async def send_and_receive_frame(self, msg: CoupMessage) -> bytes:
+        await self.send(msg)
+        return await self.receive_frame()
+
+    @abstractmethod
+    async def close(self):
+        raise NotImplementedError()
+
+
+class AsyncOpenSocket(AsyncConnection):
+    @classmethod
+    async def new(cls, host, port, length_prefixed: bool = True, codec: Codec = TEXT):
+        # asyncio already sets TCP_NODELAY on its TCP transports
+        reader, writer = await asyncio.open_connection(host, port)
+        return await cls.wrap(reader, writer, length_prefixed, codec)
+
+    @classmethod
+    async def wrap(cls, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, length_prefixed: bool = True,
+                   codec: Codec = TEXT):
+        # Client side of any connected stream
+        connection = cls(reader, writer)
+        if length_prefixed or codec is not TEXT:
+            await connection.request_length_prefix(codec)
+        return connection
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, length_prefixed: bool = False):
+        self.reader = reader
+        self.writer = writer
+        self.length_prefixed = length_prefixed
+        self._command_end = COMMAND_END.encode("UTF-8")
+        # Bytes read during the framing negotiation from a server that did not answer the hello
+        self._pending = bytearray()
+
+    async def request_length_prefix(self, codec: Codec = TEXT):
+        # Client side of the framing negotiation, as in OpenSocket.request_length_prefix
+        self.writer.write(codec.hello)
+        await self.writer.drain()
+        try:
+            answer = await self.reader.readexactly(len(LENGTH_PREFIX_HELLO))
+        except asyncio.IncompleteReadError:
+            raise ConnectionError("Connection closed during framing negotiation")
+        if answer in CODECS:
+            self.bytes_received += len(answer)
+            self.length_prefixed = True
+            self.codec = CODECS[answer]
+        else:
+            self._pending.extend(answer)
+
+    async def accept_length_prefix(self, timeout: float):
+        # Same negotiation as OpenSocket.accept_length_prefix. Legacy clients send nothing, so the wait times out.
+        try:
+            hello = await asyncio.wait_for(self.reader.readexactly(len(LENGTH_PREFIX_HELLO)), timeout)
+        except (TimeoutError, asyncio.IncompleteReadError):
+            return
+        if hello not in CODECS:
+            raise ConnectionError("Client sent an unknown framing hello")
+        self.writer.write(hello)
+        await self.writer.drain()
+        self.length_prefixed = True
+        self.codec = CODECS[hello]
+
+    def _frame(self, msg: CoupMessage) -> bytes:
+        data = self.codec.encode(msg)
+        if self.length_prefixed:
+            return LENGTH_PREFIX.pack(len(data)) + data
+        return data
+
+    async def send(self, msg: CoupMessage):
+        data = self._frame(msg)
+        self.bytes_sent += len(data)
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def send_many(self, msgs: list[CoupMessage]):
+        data = b"".join([self._frame(msg) for msg in msgs])
+        self.bytes_sent += len(data)
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def receive_frame(self) -> bytes:
+        try:
+            if self.length_prefixed:
+                (length,) = LENGTH_PREFIX.unpack(await self.reader.readexactly(LENGTH_PREFIX.size))
+                data = await self.reader.readexactly(length)
+                self.bytes_received += LENGTH_PREFIX.size
+            elif (found := self._pending.find(self._command_end)) >= 0:
+                end = found + len(self._command_end)
+                data = bytes(self._pending[:end])
+                del self._pending[:end]
+            else:
+                data = await self.reader.readuntil(self._command_end)
+                if self._pending:
+                    data = bytes(self._pending) + data
+                    self._pending.clear()
+        except asyncio.IncompleteReadError:
+            return b""
+        self.bytes_received += len(data)
+        return data
+
+    @property
+    def closed(self) -> bool:
+        # The peer closed its end. Only reliable while the peer sends nothing unasked, as unread data hides the end.
+        return self.reader.at_eof() or self.writer.is_closing()
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class BlockingConnection(Connection):
+    # Lets a Game running in a worker thread talk through an AsyncConnection owned by an event loop
+    def __init__(self, connection: AsyncConnection, loop: asyncio.AbstractEventLoop, timeout: float | None = None,
+                 latency_sink: Callable[[float], None] | None = None):
+        self.connection = connection
+        self.loop = loop
+        self.timeout = timeout
+        self.latency_sink = latency_sink
+
+    def _wait(self, coroutine: Coroutine):
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    @property
+    def bytes_sent(self) -> int:
+        return self.connection.bytes_sent
+
+    @property
+    def bytes_received(self) -> int:
+        return self.connection.bytes_received
+
+    @property
+    def codec(self) -> Codec:
+        return self.connection.codec
+
+    def set_timeout(self, seconds: float | None):
+        self.timeout = seconds
+
+    def send(self, msg: CoupMessage):
+        self._wait(self.connection.send(msg))
+
+    def send_many(self, msgs: list[CoupMessage]):
+        self._wait(self.connection.send_many(msgs))
+
+    def receive(self) -> str:
+        return self._wait(self.connection.receive())
+
+    def receive_frame(self) -> bytes:
+        return self._wait(self.connection.receive_frame())
+
+    def send_and_receive(self, msg: CoupMessage) -> str:
+        if self.latency_sink is None:
+            return self._wait(self.connection.send_and_receive(msg))
+        start = time.perf_counter()
+        result = self._wait(self.connection.send_and_receive(msg))
+        self.latency_sink(time.perf_counter() - start)
+        return result
+
+    def send_and_receive_response[R](self, msg: CoupMessage, response_type: type[R]) -> R | None:
+        if self.latency_sink is None:
+            return self.codec.decode(self._wait(self.connection.send_and_receive_frame(msg)), response_type)
+        start = time.perf_counter()
+        frame = self._wait(self.connection.send_and_receive_frame(msg))
+        self.latency_sink(time.perf_counter() - start)
+        return self.codec.decode(frame, response_type)
+
+    def abort(self):
+        # Closing on the loop ends the read a waiting _wait is blocked on. Not waited for, as it is not urgent.
+        asyncio.run_coroutine_threadsafe(self.connection.close(), self.loop)
+
+    def close(self):
+        self._wait(self.connection.close())
@@ -0,0 +1,63 @@
+import queue
+
+from connection.common import Connection
+from game.messages.common import CoupMessage
+
+# Put in the peer's inbox when one end closes
+_CLOSED = object()
+
+
+class ChannelConnection(Connection):
+    # One end of an in-memory channel between threads. Messages are passed without encoding, so the other end is
+    # trusted to send well-formed ones.
+
+    @classmethod
+    def pair(cls) -> tuple['ChannelConnection', 'ChannelConnection']:
+        # Server end and client end
+        a, b = queue.SimpleQueue(), queue.SimpleQueue()
+        return cls(a, b), cls(b, a)
+
+    def __init__(self, inbox: queue.SimpleQueue, outbox: queue.SimpleQueue):
+        self._inbox = inbox
+        self._outbox = outbox
+        self._timeout: float | None = None
+
+    def _get(self) -> CoupMessage | object:
+        try:
+            return self._inbox.get(timeout=self._timeout)
+        except queue.Empty:
+            raise TimeoutError("No message in time")
+
+    def set_timeout(self, seconds: float | None):
+        self._timeout = seconds
+
+    def send(self, msg: CoupMessage):
+        self._outbox.put(msg)
+
+    def receive(self) -> str:
+        msg = self._get()
+        return "" if msg is _CLOSED else msg.serialize()
+
+    def receive_message[M](self, message_type: type[M]) -> M | None:
+        msg = self._get()
+        if msg is _CLOSED:
+            raise EOFError("Channel closed")
+        return msg if isinstance(msg, message_type) else None
+
+    def send_and_receive(self, msg: CoupMessage) -> str:
+        self.send(msg)
+        return self.receive()
+
+    def send_and_receive_response[R](self, msg: CoupMessage, response_type: type[R]) -> R | None:
+        self.send(msg)
+        try:
+            return self.receive_message(response_type)
+        except EOFError:
+            return None
+
+    def abort(self):
+        self._inbox.put(_CLOSED)
+        self._outbox.put(_CLOSED)
+
+    def close(self):
+        self._outbox.put(_CLOSED)
@@ -1,46 +1,254 @@
+import select
 import socket
+import struct
 from abc import abstractmethod
 
+from config import COMMAND_END
+from game.messages.codec import Codec, TEXT, CODECS
 from game.messages.common import CoupMessage
 
+# Sent by a client right after connecting to ask for length-prefixed framing, and echoed back by the server to
+# accept it. Legacy clients never speak first, so they keep the COMMAND_END terminated framing. A client that wants
+# another codec sends that codec's hello instead, see game.messages.codec.CODECS.
+LENGTH_PREFIX_HELLO = TEXT.hello
+LENGTH_PREFIX = struct.Struct("!I")
+# Starting size of a connection's receive buffer. It grows if a single message does not fit.
+RECEIVE_BUFFER = 65536
+
 
 class Connection:
+    # Traffic counters, for connections that go through bytes
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    # Codec of the bytes on the wire. Connections that pass message objects never use it.
+    codec: Codec = TEXT
+
     @abstractmethod
     def send(self, msg: CoupMessage):
         raise NotImplementedError()
 
+    # Timeout for waiting for a response, None waits forever. Connections that cannot time out ignore it.
+    def set_timeout(self, seconds: float | None):
+        pass
+
+    # Connections that can write several messages at once override this
+    def send_many(self, msgs: list[CoupMessage]):
+        for msg in msgs:
+            self.send(msg)
+
     @abstractmethod
     def receive(self) -> str:
         raise NotImplementedError()
 
+    # One encoded message as it came from the wire, or empty bytes if the connection was closed
+    def receive_frame(self) -> bytes:
+        return self.receive().encode("UTF-8")
+
+    # The next message decoded with this connection's codec, or None if it is not a message of the given type.
+    # Raises EOFError if the connection was closed.
+    def receive_message[M](self, message_type: type[M]) -> M | None:
+        frame = self.receive_frame()
+        if not frame:
+            raise EOFError("Connection closed")
+        return self.codec.decode(frame, message_type)
+
     @abstractmethod
     def send_and_receive(self, msg: CoupMessage) -> str:
         raise NotImplementedError()
 
+    # Connections that do not go through text can override this to skip the serialization round trip
+    def send_and_receive_response[R](self, msg: CoupMessage, response_type: type[R]) -> R | None:
+        return response_type.deserialize(self.send_and_receive(msg))
+
     @abstractmethod
     def close(self):
         raise NotImplementedError()
 
+    # Makes a receive that is waiting in another thread return as if the peer had left. Connections whose receives
+    # can not be interrupted just close. close() is still called afterwards.
+    def abort(self):
+        self.close()
+
 
 class OpenSocket(Connection):
     @classmethod
-    def new(cls, host, port):
+    def new(cls, host, port, length_prefixed: bool = True, codec: Codec = TEXT):
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         sock.connect((host, port))
-        return cls(sock)
+        # Messages are already batched, so small writes should go out right away
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return cls.wrap(sock, length_prefixed, codec)
+
+    @classmethod
+    def wrap(cls, sock: socket.socket, length_prefixed: bool = True, codec: Codec = TEXT):
+        # Client side of any connected stream socket
+        connection = cls(sock)
+        if length_prefixed or codec is not TEXT:
+            connection.request_length_prefix(codec)
+        return connection
 
-    def __init__(self, connection):
+    def __init__(self, connection, length_prefixed: bool = False):
         self.connection = connection
+        self.length_prefixed = length_prefixed
+        # Received bytes are read straight into this buffer, and messages are returned as views into it. Bytes from
+        # _start to _end are received but not yet returned, as a single recv may hold several messages, or only a
+        # part of one.
+        self._buffer = bytearray(RECEIVE_BUFFER)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+        self._command_end = COMMAND_END.encode("UTF-8")
+
+    def _make_room(self):
+        # Moves the unread bytes to the front of the buffer. The buffer is never resized in place, as views of
+        # it may still be alive, so a bigger one is made if the unread bytes fill most of it.
+        unread = self._end - self._start
+        if unread <= self._start:
+            self._buffer[:unread] = self._view[self._start:self._end]
+        else:
+            buffer = bytearray(len(self._buffer) * 2 if unread > len(self._buffer) // 2 else len(self._buffer))
+            buffer[:unread] = self._view[self._start:self._end]
+            self._buffer, self._view = buffer, memoryview(buffer)
+        self._start, self._end = 0, unread
+
+    def _fill(self) -> bool:
+        if self._end == len(self._buffer):
+            self._make_room()
+        received = self.connection.recv_into(self._view[self._end:])
+        self.bytes_received += received
+        self._end += received
+        return received > 0
+
+    def _fill_to(self, size: int) -> bool:
+        # Until at least size bytes are unread
+        while self._end - self._start < size:
+            if not self._fill():
+                return False
+        return True
+
+    def _skip(self, size: int):
+        self._start += size
+        if self._start == self._end:
+            self._start = self._end = 0
+
+    def _next_frame(self) -> tuple[int, int] | None:
+        # Start and end of the next message in the buffer, receiving more as needed. None if the connection was
+        # closed. The bytes stay in place until the next receive.
+        start, end = self._start, self._end
+        if self.length_prefixed:
+            # Usually the whole message has already been received
+            if end - start >= LENGTH_PREFIX.size:
+                stop = start + LENGTH_PREFIX.size + LENGTH_PREFIX.unpack_from(self._buffer, start)[0]
+                if stop <= end:
+                    self._skip(stop - start)
+                    return start + LENGTH_PREFIX.size, stop
+            if not self._fill_to(LENGTH_PREFIX.size):
+                return None
+            (length,) = LENGTH_PREFIX.unpack_from(self._buffer, self._start)
+            if not self._fill_to(LENGTH_PREFIX.size + length):
+                return None
+            start = self._start + LENGTH_PREFIX.size
+            self._skip(LENGTH_PREFIX.size + length)
+            return start, start + length
+        # Relative to _start, as a fill may move the unread bytes to the front of the buffer
+        searched = 0
+        while (found := self._buffer.find(self._command_end, self._start + searched, self._end)) < 0:
+            searched = self._end - self._start
+            if not self._fill():
+                return None
+        start = self._start
+        self._skip(found + len(self._command_end) - start)
+        return start, found + len(self._command_end)
+
+    def request_length_prefix(self, codec: Codec = TEXT):
+        # Client side of the framing negotiation. The server answers with the hello of the codec it agreed to, and
+        # legacy servers with their first message.
+        self.connection.sendall(codec.hello)
+        if not self._fill_to(len(LENGTH_PREFIX_HELLO)):
+            raise ConnectionError("Connection closed during framing negotiation")
+        agreed = CODECS.get(bytes(self._view[self._start:self._start + len(LENGTH_PREFIX_HELLO)]))
+        if agreed is not None:
+            self._skip(len(LENGTH_PREFIX_HELLO))
+            self.length_prefixed = True
+            self.codec = agreed
+
+    def accept_length_prefix(self, timeout: float):
+        # Server side of the framing negotiation. Waits a moment for the hello, which new clients send right away.
+        readable, _, _ = select.select([self.connection], [], [], timeout)
+        if not readable:
+            return
+        while self.take_hello() is None:
+            if not self._fill():
+                return
+
+    def receive_available(self) -> bool:
+        # Receives what has arrived, for a socket a selector found readable. False if the connection was closed.
+        return self._fill()
+
+    def take_hello(self) -> bool | None:
+        # Server side of the framing negotiation, on the bytes received so far. True if they were a hello, which is
+        # answered, False if the client did not send one, and None if they may still become one.
+        hello = bytes(self._view[self._start:min(self._end, self._start + len(LENGTH_PREFIX_HELLO))])
+        if hello in CODECS:
+            self._skip(len(hello))
+            self.connection.sendall(hello)
+            self.length_prefixed = True
+            self.codec = CODECS[hello]
+            return True
+        if len(hello) < len(LENGTH_PREFIX_HELLO) and any(h.startswith(hello) for h in CODECS):
+            return None
+        return False
+
+    def _frame(self, msg: CoupMessage) -> bytes:
+        data = self.codec.encode(msg)
+        if self.length_prefixed:
+            return LENGTH_PREFIX.pack(len(data)) + data
+        return data
 
     def send(self, msg: CoupMessage):
-        self.connection.sendall(msg.serialize().encode("UTF-8"))
+        data = self._frame(msg)
+        self.bytes_sent += len(data)
+        self.connection.sendall(data)
+
+    def send_many(self, msgs: list[CoupMessage]):
+        data = b"".join([self._frame(msg) for msg in msgs])
+        self.bytes_sent += len(data)
+        self.connection.sendall(data)
+
+    def receive_frame(self) -> memoryview:
+        # Returns exactly one message, or an empty view if the connection was closed. The view is into the receive
+        # buffer, so it is only valid until the next receive.
+        frame = self._next_frame()
+        return memoryview(b"") if frame is None else self._view[frame[0]:frame[1]]
+
+    def receive_message[M](self, message_type: type[M]) -> M | None:
+        # Decodes straight from the receive buffer, without copying the message out first
+        frame = self._next_frame()
+        if frame is None:
+            raise EOFError("Connection closed")
+        return self.codec.decode_from(self._buffer, frame[0], frame[1], message_type)
 
     def receive(self) -> str:
-        return self.connection.recv(1024).decode("UTF-8")
+        # Text codec only
+        return str(self.receive_frame(), "UTF-8")
 
     def send_and_receive(self, msg: CoupMessage) -> str:
         self.send(msg)
         return self.receive()
 
+    def send_and_receive_response[R](self, msg: CoupMessage, response_type: type[R]) -> R | None:
+        self.send(msg)
+        frame = self._next_frame()
+        return None if frame is None else self.codec.decode_from(self._buffer, frame[0], frame[1], response_type)
+
+    def set_timeout(self, seconds: float | None):
+        self.connection.settimeout(seconds)
+
+    def abort(self):
+        try:
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
     def close(self):
         self.connection.close()
@@ -1,21 +1,90 @@
+import selectors
 import socket
+import threading
+import time
 
-from common.common import debug_print
-from config import HOST, PORT
-from connection.common import OpenSocket
+from common.common import server_log
+from config import FRAMING_HANDSHAKE_TIMEOUT, DECISION_TIMEOUT
+from connection.address import DEFAULT_ADDRESS, listen, parse_address
+from connection.common import Connection, OpenSocket
+from connection.sharedmemory import SharedMemorySetup
 
 
-def get_connections(amount):
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.bind((HOST, PORT))
-    sock.listen()
+def get_connections(amount, address: str = DEFAULT_ADDRESS, framing_timeout: float = FRAMING_HANDSHAKE_TIMEOUT,
+                    started: threading.Event | None = None) -> list[Connection]:
+    # New connections are accepted while earlier ones are still negotiating their framing or setting up shared
+    # memory, so a client that is slow to send its hello, or a legacy one that never does, does not hold up the
+    # others. Seats go in the order the negotiations finish.
+    scheme, _ = parse_address(address)
+    shared_memory = scheme == "shm"
+    sock = listen(address)
+    # Clients may connect from here on
+    if started is not None:
+        started.set()
+    selector = selectors.DefaultSelector()
+    selector.register(sock, selectors.EVENT_READ)
+    # Negotiation deadline of every socket that has not finished it. The selector keys hold their OpenSocket or
+    # SharedMemorySetup.
+    negotiating: dict[socket.socket, float] = {}
+    socks: list[Connection] = []
 
-    socks = []
+    def finish(connect: socket.socket) -> OpenSocket | SharedMemorySetup:
+        del negotiating[connect]
+        return selector.unregister(connect).data
 
+    def drop(connect: socket.socket, reason: str):
+        server_log.debug("Dropped a client: %s", reason)
+        finish(connect).close()
+
+    server_log.debug("Waiting for connections...")
     while len(socks) < amount:
-        debug_print("Waiting for connection...")
-        connect, address = sock.accept()
-        connect.settimeout(10)
-        socks.append(OpenSocket(connect))
+        timeout = max(0.0, min(negotiating.values()) - time.monotonic()) if negotiating else None
+        for key, _ in selector.select(timeout):
+            if key.fileobj is sock:
+                connect, _ = sock.accept()
+                if shared_memory:
+                    pending = SharedMemorySetup(connect)
+                else:
+                    connect.settimeout(DECISION_TIMEOUT)
+                    if connect.family != socket.AF_UNIX:
+                        connect.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    pending = OpenSocket(connect)
+                negotiating[connect] = time.monotonic() + framing_timeout
+                selector.register(connect, selectors.EVENT_READ, pending)
+            elif key.fileobj in negotiating:
+                try:
+                    connection = _negotiate(key.data)
+                except (TimeoutError, OSError) as e:
+                    drop(key.fileobj, str(e))
+                    continue
+                if connection is not None:
+                    finish(key.fileobj)
+                    connection.set_timeout(DECISION_TIMEOUT)
+                    socks.append(connection)
+        # Clients that stayed silent keep the legacy framing, and shared memory clients that did not finish the setup
+        # are dropped
+        now = time.monotonic()
+        for connect in [c for c, deadline in negotiating.items() if deadline <= now]:
+            if shared_memory:
+                drop(connect, "shared memory setup timed out")
+            else:
+                socks.append(finish(connect))
+
+    # Clients that arrived after the table filled up
+    for connection in socks[amount:]:
+        connection.close()
+    for connect in list(negotiating):
+        finish(connect).close()
+    selector.close()
+    sock.close()
+    return socks[:amount]
+
 
-    return socks
+def _negotiate(pending: OpenSocket | SharedMemorySetup) -> Connection | None:
+    # Takes what a negotiating client has sent. Returns its connection once the negotiation is done, and raises
+    # ConnectionError if the client left.
+    if isinstance(pending, SharedMemorySetup):
+        return pending.advance()
+    if not pending.receive_available():
+        raise ConnectionError("Connection closed during framing negotiation")
+    return pending if pending.take_hello() is not None else None
@@ -0,0 +1,336 @@
+import os
+import select
+import socket
+import time
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from connection.common import Connection, LENGTH_PREFIX
+from game.messages.codec import Codec, TEXT, CODECS
+from game.messages.common import CoupMessage
+
+# Bytes of message data in each direction. A single message must fit in it.
+RING_SIZE = 65536
+# Seconds a reader polls an empty ring before it goes to sleep and asks the writer for a wakeup. Bots usually answer
+# well within this, and a wakeup costs two system calls.
+SPIN_SECONDS = 0.0005
+# Seconds a sleeping reader waits for a wakeup before it looks at the ring again. Only matters if a wakeup is lost,
+# see Ring.wait_readable.
+WAKEUP_POLL = 0.01
+# Seconds a writer waits between looks at a full ring
+FULL_POLL = 0.0005
+# Doorbell events of the peer closing. They do not depend on unread wakeups, which belong to the reader.
+_PEER_CLOSED = getattr(select, "POLLRDHUP", 0) | select.POLLHUP
+
+# Header fields, as indices of 64-bit integers. The indices only ever grow, so they never wrap in practice. Each
+# field is on its own cache line, as the two processes write different ones.
+_WRITTEN = 0
+_READ = 8
+_READER_SLEEPING = 16
+_HEADER = 192
+# Length of a frame that marks the rest of the ring as unused, when the next frame would not fit before the end
+_WRAP = 0xFFFFFFFF
+# Segments made by this process, which the resource tracker already knows
+_created: set[str] = set()
+
+
+class Ring:
+    # Single-producer single-consumer queue of frames in shared memory. Each side only moves its own index, so no lock
+    # is taken. Frames are never split over the end of the ring, so they can be decoded in place.
+
+    def __init__(self, memory: SharedMemory, size: int):
+        self.memory = memory
+        self.size = size
+        # Items of a cast view are much faster to get and set than struct is
+        self._header = memory.buf[:_HEADER].cast("Q")
+        self._data = memory.buf[_HEADER:_HEADER + size]
+
+    @classmethod
+    def create(cls, size: int = RING_SIZE) -> 'Ring':
+        # Fresh shared memory is all zeros, which is an empty ring
+        memory = SharedMemory(create=True, size=_HEADER + size)
+        _created.add(memory.name)
+        return cls(memory, size)
+
+    @classmethod
+    def attach(cls, name: str, size: int) -> 'Ring':
+        memory = SharedMemory(name)
+        # SharedMemory registers every segment it opens with the resource tracker, which unlinks it when this process
+        # exits. Only the creator may unlink it, so a segment made by another process is unregistered again.
+        if memory.name not in _created:
+            resource_tracker.unregister(memory._name, "shared_memory")
+        return cls(memory, size)
+
+    def readable(self) -> bool:
+        return self._header[_WRITTEN] != self._header[_READ]
+
+    def write(self, frames: list[bytes]) -> bool:
+        # Writes all frames, or nothing if there is not enough free space. The frames become visible to the reader
+        # at once, when the written index is stored.
+        written, read = self._header[_WRITTEN], self._header[_READ]
+        for data in frames:
+            needed = LENGTH_PREFIX.size + len(data)
+            if needed + LENGTH_PREFIX.size > self.size:
+                raise ValueError(f"Message of {len(data)} bytes does not fit in a ring of {self.size}")
+            position = written % self.size
+            if position + needed > self.size:
+                if written + self.size - position + needed - read > self.size:
+                    return False
+                if self.size - position >= LENGTH_PREFIX.size:
+                    LENGTH_PREFIX.pack_into(self._data, position, _WRAP)
+                written += self.size - position
+                position = 0
+            elif written + needed - read > self.size:
+                return False
+            LENGTH_PREFIX.pack_into(self._data, position, len(data))
+            self._data[position + LENGTH_PREFIX.size:position + needed] = data
+            written += needed
+        self._header[_WRITTEN] = written
+        return True
+
+    def next_frame(self) -> tuple[int, int]:
+        # Start and end of the oldest frame in the data. The ring must be readable. The frame stays in place until
+        # it is released with consume.
+        read = self._header[_READ]
+        position = read % self.size
+        if self.size - position < LENGTH_PREFIX.size or LENGTH_PREFIX.unpack_from(self._data, position)[0] == _WRAP:
+            read += self.size - position
+            self._header[_READ] = read
+            position = 0
+        (length,) = LENGTH_PREFIX.unpack_from(self._data, position)
+        return position + LENGTH_PREFIX.size, position + LENGTH_PREFIX.size + length
+
+    def consume(self, end: int):
+        read = self._header[_READ]
+        self._header[_READ] = read - read % self.size + end
+
+    @property
+    def data(self) -> memoryview:
+        return self._data
+
+    def wait_readable(self, doorbell: socket.socket, deadline: float | None) -> bool:
+        # Polls for a moment, then sleeps until the writer rings the doorbell. Returns False if the doorbell socket
+        # was closed. Raises TimeoutError at the deadline.
+        spin_until = time.perf_counter() + SPIN_SECONDS
+        while not self.readable():
+            now = time.perf_counter()
+            if deadline is not None and now >= deadline:
+                raise TimeoutError("No message in time")
+            if now < spin_until:
+                # Lets the writer run, in case it is a thread of this process or shares the core
+                os.sched_yield()
+                continue
+            self._header[_READER_SLEEPING] = 1
+            # The writer may have written just before the flag was set, and then it did not ring
+            if self.readable():
+                break
+            # Without a memory barrier the writer may still miss the flag, so the sleep is never long
+            timeout = WAKEUP_POLL if deadline is None else max(0.0, min(WAKEUP_POLL, deadline - now))
+            readable, _, _ = select.select([doorbell], [], [], timeout)
+            if readable and not doorbell.recv(4096):
+                return self.readable()
+        self._header[_READER_SLEEPING] = 0
+        return True
+
+    def reader_sleeping(self) -> bool:
+        return self._header[_READER_SLEEPING] != 0
+
+    def release(self):
+        # Views into the segment must be gone before it can be closed
+        self._header.release()
+        self._data.release()
+        self.memory.close()
+
+
+class SharedMemoryConnection(Connection):
+    # A ring in shared memory in each direction. The setup socket stays open as a doorbell: a byte is sent on it only
+    # when the reader has gone to sleep, and closing it closes the connection.
+
+    @classmethod
+    def accept(cls, sock: socket.socket, timeout: float, size: int = RING_SIZE) -> 'SharedMemoryConnection':
+        # Server side of the setup, for a single client. The socket is closed if the setup fails.
+        sock.settimeout(timeout)
+        setup = SharedMemorySetup(sock, size)
+        try:
+            while (connection := setup.advance()) is None:
+                pass
+        except BaseException:
+            setup.close()
+            raise
+        return connection
+
+    @classmethod
+    def connect(cls, path: str, codec: Codec = TEXT) -> 'SharedMemoryConnection':
+        # Client side of the setup, over the server's unix socket at path
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+        sock.sendall(codec.hello)
+        (length,) = LENGTH_PREFIX.unpack(cls._receive_exactly(sock, LENGTH_PREFIX.size))
+        size, inbox_name, outbox_name = cls._receive_exactly(sock, length).decode("UTF-8").split(" ")
+        inbox, outbox = Ring.attach(inbox_name, int(size)), Ring.attach(outbox_name, int(size))
+        sock.sendall(b"\x01")
+        return cls(sock, inbox, outbox, codec)
+
+    @staticmethod
+    def _receive_exactly(sock: socket.socket, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            received = sock.recv(size - len(data))
+            if not received:
+                raise ConnectionError("Connection closed during shared memory setup")
+            data += received
+        return data
+
+    def __init__(self, doorbell: socket.socket, inbox: Ring, outbox: Ring, codec: Codec = TEXT):
+        self._doorbell = doorbell
+        self._inbox = inbox
+        self._outbox = outbox
+        self.codec = codec
+        self._timeout: float | None = None
+        self._closed = False
+
+    def set_timeout(self, seconds: float | None):
+        self._timeout = seconds
+
+    def _write(self, frames: list[bytes]):
+        if not self._outbox.write(frames):
+            # The batch may not fit even in an empty ring, so its frames are written one by one as space frees up
+            for data in frames:
+                if not self._outbox.write([data]):
+                    self._wake_reader()
+                    self._wait_writable([data])
+        self.bytes_sent += sum(len(data) for data in frames)
+        self._wake_reader()
+
+    def _wake_reader(self):
+        if self._outbox.reader_sleeping():
+            self._doorbell.send(b"\x00")
+
+    def _wait_writable(self, frames: list[bytes]):
+        # The reader is behind, and sockets block in sendall the same way. The doorbell is only polled, as reading it
+        # would take wakeups meant for this side's reader.
+        deadline = None if self._timeout is None else time.perf_counter() + self._timeout
+        poll = select.poll()
+        poll.register(self._doorbell, _PEER_CLOSED)
+        while not self._outbox.write(frames):
+            if poll.poll(FULL_POLL * 1000):
+                raise BrokenPipeError("Connection closed")
+            if deadline is not None and time.perf_counter() >= deadline:
+                raise TimeoutError("Ring stayed full")
+
+    def send(self, msg: CoupMessage):
+        self._write([self.codec.encode(msg)])
+
+    def send_many(self, msgs: list[CoupMessage]):
+        self._write([self.codec.encode(msg) for msg in msgs])
+
+    def _next_frame(self) -> tuple[int, int] | None:
+        # Frame of the next message in the inbox, or None if the connection was closed
+        deadline = None if self._timeout is None else time.perf_counter() + self._timeout
+        if not self._inbox.readable() and not self._inbox.wait_readable(self._doorbell, deadline):
+            return None
+        start, end = self._inbox.next_frame()
+        self.bytes_received += end - start
+        return start, end
+
+    def receive_frame(self) -> bytes:
+        # A copy, as the ring space is given back to the writer right away
+        frame = self._next_frame()
+        if frame is None:
+            return b""
+        data = bytes(self._inbox.data[frame[0]:frame[1]])
+        self._inbox.consume(frame[1])
+        return data
+
+    def receive_message[M](self, message_type: type[M]) -> M | None:
+        # Decodes in place, and only then gives the space back to the writer
+        frame = self._next_frame()
+        if frame is None:
+            raise EOFError("Connection closed")
+        try:
+            return self.codec.decode(self._inbox.data[frame[0]:frame[1]], message_type)
+        finally:
+            self._inbox.consume(frame[1])
+
+    def receive(self) -> str:
+        # Text codec only
+        return self.receive_frame().decode("UTF-8")
+
+    def send_and_receive(self, msg: CoupMessage) -> str:
+        self.send(msg)
+        return self.receive()
+
+    def send_and_receive_response[R](self, msg: CoupMessage, response_type: type[R]) -> R | None:
+        self.send(msg)
+        try:
+            return self.receive_message(response_type)
+        except EOFError:
+            return None
+
+    def abort(self):
+        # The rings stay mapped until close, as the waiting receive still reads them
+        try:
+            self._doorbell.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            # The peer sees the doorbell close. Messages already in the ring stay readable for it.
+            self._doorbell.close()
+            self._inbox.release()
+            self._outbox.release()
+
+
+class SharedMemorySetup:
+    # Server side of the setup, one step each time the client sent something, so many clients are set up at once. The
+    # rings are unlinked once the client has attached, so they are freed whenever both processes are gone.
+
+    def __init__(self, sock: socket.socket, size: int = RING_SIZE):
+        self.sock = sock
+        self._size = size
+        self._received = b""
+        self._codec: Codec | None = None
+        self._rings: tuple[Ring, Ring] | None = None
+
+    def advance(self) -> SharedMemoryConnection | None:
+        # Receives once. Returns the connection when the setup is done, and raises ConnectionError if the client left
+        # or broke the protocol.
+        received = self.sock.recv(4096)
+        if not received:
+            raise ConnectionError("Connection closed during shared memory setup")
+        self._received += received
+        if self._rings is None:
+            hello = self._received[:len(TEXT.hello)]
+            if len(hello) < len(TEXT.hello):
+                return None
+            self._codec = CODECS.get(hello)
+            if self._codec is None:
+                raise ConnectionError(f"Unknown codec hello {hello!r}")
+            self._received = self._received[len(hello):]
+            self._rings = inbox, outbox = Ring.create(self._size), Ring.create(self._size)
+            setup = f"{self._size} {outbox.memory.name} {inbox.memory.name}".encode("UTF-8")
+            self.sock.sendall(LENGTH_PREFIX.pack(len(setup)) + setup)
+            if not self._received:
+                return None
+        if self._received != b"\x01":
+            raise ConnectionError("Client did not attach to the shared memory")
+        inbox, outbox = self._rings
+        self._unlink()
+        self.sock.settimeout(None)
+        return SharedMemoryConnection(self.sock, inbox, outbox, self._codec)
+
+    def _unlink(self):
+        for ring in self._rings:
+            ring.memory.unlink()
+            _created.discard(ring.memory.name)
+
+    def close(self):
+        # Gives up on an unfinished setup
+        if self._rings is not None:
+            for ring in self._rings:
+                ring.release()
+            self._unlink()
+            self._rings = None
+        self.sock.close()
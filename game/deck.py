@@ -0,0 +1,19 @@
+import random
+
+from game.enums.cards import Card
+
+
+class Deck(list[Card]):
+    # The deck is kept in no particular order. Drawing takes a uniformly random card, which is the same as shuffling
+    # before every draw, so the deck never needs shuffling.
+    def __init__(self, cards: list[Card] = (), rng: random.Random | None = None):
+        super().__init__(cards)
+        self.rng = rng if rng is not None else random.Random()
+
+    def draw(self) -> Card:
+        i = self.rng.randrange(len(self))
+        self[i], self[-1] = self[-1], self[i]
+        return self.pop()
+
+    def put_back(self, card: Card):
+        self.append(card)
@@ -2,6 +2,20 @@ from game.enums.cards import *
 
 
 class Action:
+    # Every action exists only once, so actions are compared and hashed by identity
+    _by_name: dict[str, 'Action'] = {}
+
+    def __new__(cls):
+        instance = cls.__dict__.get("_instance")
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instance = instance
+        return instance
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Action._by_name[cls.name] = cls()
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -29,7 +43,10 @@ class Action:
 
     @classmethod
     def with_name(cls, name: str) -> 'Action':
-        return [a for a in cls.all() if a.name == name][0]
+        try:
+            return Action._by_name[name]
+        except KeyError:
+            raise ValueError(f"No action named {name}") from None
 
     def __str__(self):
         return self.name
@@ -37,9 +54,6 @@ class Action:
     def __repr__(self):
         return str(self)
 
-    def __eq__(self, other: 'Action'):
-        return self.name == other.name
-
     @classmethod
     def all(cls) -> list['Action']:
         return [sub() for sub in cls.__subclasses__()]
@@ -120,3 +134,16 @@ class Ambassadate(Action):
 
     def __init__(self):
         pass
+
+
+# Ids of the actions in event logs and the binary codec. They are stored and sent, so they are never reused or
+# changed.
+ACTION_IDS: dict[Action, int] = {
+    Steal(): 0,
+    Assassinate(): 1,
+    ForeignAid(): 2,
+    Income(): 3,
+    Tax(): 4,
+    Coup(): 5,
+    Ambassadate(): 6,
+}
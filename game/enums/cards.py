@@ -2,6 +2,20 @@ from abc import abstractmethod
 
 
 class Card:
+    # Every card exists only once, so cards are compared and hashed by identity
+    _by_name: dict[str, 'Card'] = {}
+
+    def __new__(cls):
+        instance = cls.__dict__.get("_instance")
+        if instance is None:
+            instance = super().__new__(cls)
+            cls._instance = instance
+        return instance
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        Card._by_name[cls.name] = cls()
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -9,7 +23,10 @@ class Card:
 
     @classmethod
     def with_name(cls, name: str) -> 'Card':
-        return [c for c in cls.all() if c.name == name][0]
+        try:
+            return Card._by_name[name]
+        except KeyError:
+            raise ValueError(f"No card named {name}") from None
 
     def __str__(self):
         return self.name
@@ -17,16 +34,10 @@ class Card:
     def __repr__(self):
         return str(self)
 
-    def __eq__(self, other: 'Card'):
-        return self.name == other.name
-
     @classmethod
     def all(cls) -> list['Card']:
         return [sub() for sub in cls.__subclasses__()]
 
-    def __hash__(self):
-        return hash(self.name)
-
 
 class Duke(Card):
     name = "duke"
@@ -61,3 +72,13 @@ class Ambassador(Card):
 
     def __init__(self):
         pass
+
+
+# Ids of the cards in event logs and the binary codec. They are stored and sent, so they are never reused or changed.
+CARD_IDS: dict[Card, int] = {
+    Duke(): 0,
+    Contessa(): 1,
+    Assassin(): 2,
+    Captain(): 3,
+    Ambassador(): 4,
+}
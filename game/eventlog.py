@@ -0,0 +1,125 @@
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import BinaryIO
+
+from game.enums.actions import Action, ACTION_IDS
+from game.enums.cards import Card, CARD_IDS
+
+# Cards and actions are stored as their CARD_IDS and ACTION_IDS
+_CARDS = {i: c for c, i in CARD_IDS.items()}
+_ACTIONS = {i: a for a, i in ACTION_IDS.items()}
+
+# Every event is one fixed size record: kind, actor, target, action, card, blocker, challenger, success, amount.
+# Fields that do not apply to an event kind are -1, or 0 for success and amount.
+RECORD = struct.Struct("<Bbbbbbbbh")
+
+
+class EventKind(IntEnum):
+    GAME_START = 0
+    GAME_END = 1
+    ACTION = 2
+    BLOCK = 3
+    CHALLENGE = 4
+    BLOCK_CHALLENGE = 5
+    CARD_LOSS = 6
+    MONEY_CHANGE = 7
+    RULE_VIOLATION = 8
+
+
+@dataclass(frozen=True)
+class Event:
+    kind: EventKind
+    # The player the event is about: action taker, card loser, money receiver, winner
+    actor: int = -1
+    target: int = -1
+    action: Action | None = None
+    # Block card, or the lost card
+    card: Card | None = None
+    blocker: int = -1
+    challenger: int = -1
+    success: bool = False
+    # Money change, or the amount of players for GAME_START
+    amount: int = 0
+
+    @classmethod
+    def unpack_from(cls, buffer: bytes | memoryview, offset: int = 0) -> 'Event':
+        kind, actor, target, action, card, blocker, challenger, success, amount = RECORD.unpack_from(buffer, offset)
+        return cls(EventKind(kind), actor, target, None if action < 0 else _ACTIONS[action],
+                   None if card < 0 else _CARDS[card], blocker, challenger, bool(success), amount)
+
+
+class EventLog:
+    # Append-only writer. Game only calls it when it is given one, so a game without a log pays nothing.
+    def __init__(self, file: BinaryIO):
+        self.file = file
+
+    @classmethod
+    def open(cls, path: str) -> 'EventLog':
+        return cls(open(path, "ab"))
+
+    def _write(self, kind: EventKind, actor: int = -1, target: int = -1, action: Action | None = None,
+               card: Card | None = None, blocker: int = -1, challenger: int = -1, success: bool = False,
+               amount: int = 0):
+        self.file.write(RECORD.pack(kind, actor, target,
+                                    -1 if action is None else ACTION_IDS[action],
+                                    -1 if card is None else CARD_IDS[card],
+                                    blocker, challenger, success, amount))
+
+    def game_start(self, players: int):
+        self._write(EventKind.GAME_START, amount=players)
+
+    def game_end(self, winner: int):
+        self._write(EventKind.GAME_END, actor=winner)
+
+    def action(self, actor: int, action: Action, target: int):
+        self._write(EventKind.ACTION, actor, target, action)
+
+    def block(self, actor: int, action: Action, target: int, card: Card, blocker: int):
+        self._write(EventKind.BLOCK, actor, target, action, card, blocker)
+
+    def challenge(self, actor: int, action: Action, target: int, challenger: int, success: bool):
+        self._write(EventKind.CHALLENGE, actor, target, action, challenger=challenger, success=success)
+
+    def block_challenge(self, actor: int, action: Action, target: int, card: Card, blocker: int, challenger: int,
+                        success: bool):
+        self._write(EventKind.BLOCK_CHALLENGE, actor, target, action, card, blocker, challenger, success)
+
+    def card_loss(self, player: int, card: Card):
+        self._write(EventKind.CARD_LOSS, player, card=card)
+
+    def money_change(self, player: int, amount: int):
+        self._write(EventKind.MONEY_CHANGE, player, amount=amount)
+
+    def rule_violation(self, player: int):
+        self._write(EventKind.RULE_VIOLATION, player)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def read_events(file: BinaryIO, chunk_records: int = 4096) -> Iterator[Event]:
+    # Streams the events of a log file, reading it in chunks. Works on a log that is still being written too.
+    rest = b""
+    while chunk := file.read(RECORD.size * chunk_records):
+        data = rest + chunk
+        whole = len(data) - len(data) % RECORD.size
+        for offset in range(0, whole, RECORD.size):
+            yield Event.unpack_from(data, offset)
+        rest = data[whole:]
+
+
+def read_games(file: BinaryIO) -> Iterator[list[Event]]:
+    # Groups the events by game, from GAME_START to GAME_END, for replaying games one at a time
+    game: list[Event] = []
+    for event in read_events(file):
+        if event.kind == EventKind.GAME_START:
+            game = []
+        game.append(event)
+        if event.kind == EventKind.GAME_END:
+            yield game
+            game = []
@@ -1,31 +1,51 @@
-from dataclasses import dataclass
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
 
-from common.common import debug_print
+from common.common import client_log, protocol_log
 from config import PARAM_SPLITTER, CONTROL_CHAR_REPLACE, COMMAND_END, START_MONEY, START_CARDS_AMOUNT
+from connection.asynchronous import AsyncConnection
 from connection.common import Connection
 from game.logic.clients import ClientLogic, OpponentState, ClientState
 from game.messages.commands import *
 from game.messages.responses import *
 
 
-@dataclass
+@dataclass(slots=True)
 class MutableOpponentState:
     money: int
     cards_amount: int
     dead_cards: list[Card]
     number: int
     name: str
+    _snapshot: OpponentState | None = field(default=None, repr=False, compare=False)
 
     def reset(self):
         self.money = START_MONEY
         self.cards_amount = START_CARDS_AMOUNT
         self.dead_cards = []
+        self._snapshot = None
 
     def __init__(self, number: int, name: str):
         self.number = number
         self.name = name
         self.reset()
 
+    def change_money(self, amount: int):
+        self.money += amount
+        self._snapshot = None
+
+    def lose_card(self, card: Card):
+        self.cards_amount -= 1
+        self.dead_cards.append(card)
+        self._snapshot = None
+
+    def snapshot(self) -> OpponentState:
+        # Kept until this opponent changes, so unchanged opponents are not copied again
+        if self._snapshot is None:
+            self._snapshot = OpponentState(self.number, self.cards_amount, tuple(self.dead_cards), self.money)
+        return self._snapshot
+
 
 class PlayerClient:
     def __init__(self, connection: Connection, logic: ClientLogic):
@@ -39,114 +59,225 @@ class PlayerClient:
         self.cards: list[Card] = []
         self.money: int = 0
         self.number: int = -1
+        self.time_bank: float | None = None
+        # Last state given to the logic. Handlers that change the state above drop it, and it is rebuilt only
+        # when the logic asks for it again.
+        self._state: ClientState | None = None
+
+        self._handlers: dict[type[Command], Callable[[Command], Response | None]] = {
+            command_type: getattr(self, name) for command_type, name in self.HANDLERS.items()}
 
         self.logic.set_state_fetch_function(self.get_client_state)
 
     def get_client_state(self) -> ClientState:
-        opponents = {opp.number: OpponentState(opp.number, opp.cards_amount, opp.dead_cards, opp.money) for opp in
-                     self.opponents.values()}
-        return ClientState(self.number, self.cards, self.dead_cards, self.money, opponents)
+        if self._state is None:
+            opponents = {opp.number: opp.snapshot() for opp in self.opponents.values()}
+            self._state = ClientState(self.number, tuple(self.cards), tuple(self.dead_cards), self.money, opponents,
+                                      self.time_bank)
+        return self._state
 
     def reset_state(self):
+        self._state = None
         self.cards = []
         self.money = 0
         self.dead_cards = []
+        for opp in self.opponents.values():
+            opp.reset()
+
+    def shutdown(self):
+        self.connection.close()
+        self.logic.shutdown()
+        self.running = False
+
+    # Setup and meta
+    def _on_debug_message(self, command: DebugMessage):
+        client_log.debug("%s", command.message)
+
+    def _on_shutdown(self, command: Shutdown):
+        self.shutdown()
+
+    def _on_ask_name(self, command: AskName) -> Response:
+        return NameResponse(self.logic.ask_name()
+                            .replace(PARAM_SPLITTER, CONTROL_CHAR_REPLACE)
+                            .replace(COMMAND_END, CONTROL_CHAR_REPLACE))
+
+    def _on_add_opponent(self, command: AddOpponent):
+        self._state = None
+        self.opponents[command.number] = MutableOpponentState(command.number, command.player_name)
+        self.logic.add_opponent(command.number, command.player_name)
+
+    def _on_set_player_number(self, command: SetPlayerNumber):
+        self._state = None
+        self.number = command.number
+        self.logic.set_player_number(command.number)
+
+    def _on_new_game(self, command: NewGame):
+        self.reset_state()
+        self.logic.new_game()
+
+    # State changes
+    def _on_add_card(self, command: AddCard):
+        self._state = None
+        self.cards.append(command.card)
+        self.logic.add_card(command.card)
+
+    def _on_change_money(self, command: ChangeMoney):
+        self._state = None
+        self.money += command.amount
+        self.logic.change_money(command.amount)
+
+    def _on_remove_card(self, command: RemoveCard):
+        self._state = None
+        self.cards.remove(command.card)
+        self.logic.remove_card(command.card)
+
+    def _on_player_lost_a_card(self, command: PlayerLostACard):
+        if command.player in self.opponents:
+            self._state = None
+            self.opponents[command.player].lose_card(command.card)
+        self.logic.player_lost_a_card(command.player, command.card)
+
+    def _on_money_changed(self, command: MoneyChanged):
+        if command.player in self.opponents:
+            self._state = None
+            self.opponents[command.player].change_money(command.amount)
+        self.logic.money_changed(command.player, command.amount)
+
+    def _on_time_bank_left(self, command: TimeBankLeft):
+        self._state = None
+        self.time_bank = command.milliseconds / 1000
+
+    def _on_player_violated_rules(self, command: PlayerViolatedRules):
+        if command.number in self.opponents:
+            self._state = None
+            self.opponents.pop(command.number)
+        self.logic.a_player_violated_rules(command.number)
+
+    # Card decisions
+    def _on_choose_card_to_kill(self, command: ChooseCardToKill) -> Response:
+        return self.logic.choose_card_to_kill()
+
+    def _on_choose_ambassador_cards_to_remove(self, command: ChooseAmbassadorCardsToRemove) -> Response:
+        return self.logic.choose_ambassador_cards_to_remove()
+
+    # Turn flow
+    def _on_take_turn(self, command: TakeTurn) -> Response:
+        return self.logic.take_turn()
+
+    def _on_your_action_is_challenged(self, command: YourActionIsChallenged) -> Response:
+        return self.logic.your_action_is_challenged(command.action, command.target, command.challenger)
+
+    def _on_your_block_is_challenged(self, command: YourBlockIsChallenged) -> Response:
+        return self.logic.your_block_is_challenged(command.action, command.action_doer, command.block_card,
+                                                   command.challenger)
+
+    def _on_do_you_block(self, command: DoYouBlock) -> Response:
+        return self.logic.do_you_block(command.action, command.action_doer)
+
+    def _on_do_you_challenge_action(self, command: DoYouChallengeAction) -> Response:
+        return self.logic.do_you_challenge_action(command.action, command.action_doer, command.target)
+
+    def _on_do_you_challenge_block(self, command: DoYouChallengeBlock) -> Response:
+        return self.logic.do_you_challenge_block(command.action, command.action_doer, command.target,
+                                                 command.block_card, command.blocked_by)
+
+    # Log
+    def _on_action_was_taken(self, command: ActionWasTaken):
+        self.logic.action_was_taken(command.action, command.action_doer, command.target)
+
+    def _on_action_was_blocked(self, command: ActionWasBlocked):
+        self.logic.action_was_blocked(command.action, command.action_doer, command.target, command.block_card,
+                                      command.blocked_by)
+
+    def _on_action_was_challenged(self, command: ActionWasChallenged):
+        self.logic.action_was_challenged(command.action, command.action_doer, command.target, command.challenger,
+                                         command.success)
+
+    def _on_block_was_challenged(self, command: BlockWasChallenged):
+        self.logic.block_was_challenged(command.action, command.action_taker, command.target, command.block_card,
+                                        command.blocked_by, command.challenger, command.success)
+
+    # Command type -> name of the method handling it. Bound once per client in __init__, so subclasses can
+    # override single handlers.
+    HANDLERS: dict[type[Command], str] = {
+        DebugMessage: "_on_debug_message",
+        Shutdown: "_on_shutdown",
+        AskName: "_on_ask_name",
+        AddOpponent: "_on_add_opponent",
+        SetPlayerNumber: "_on_set_player_number",
+        NewGame: "_on_new_game",
+        AddCard: "_on_add_card",
+        ChangeMoney: "_on_change_money",
+        RemoveCard: "_on_remove_card",
+        PlayerLostACard: "_on_player_lost_a_card",
+        MoneyChanged: "_on_money_changed",
+        TimeBankLeft: "_on_time_bank_left",
+        PlayerViolatedRules: "_on_player_violated_rules",
+        ChooseCardToKill: "_on_choose_card_to_kill",
+        ChooseAmbassadorCardsToRemove: "_on_choose_ambassador_cards_to_remove",
+        TakeTurn: "_on_take_turn",
+        YourActionIsChallenged: "_on_your_action_is_challenged",
+        YourBlockIsChallenged: "_on_your_block_is_challenged",
+        DoYouBlock: "_on_do_you_block",
+        DoYouChallengeAction: "_on_do_you_challenge_action",
+        DoYouChallengeBlock: "_on_do_you_challenge_block",
+        ActionWasTaken: "_on_action_was_taken",
+        ActionWasBlocked: "_on_action_was_blocked",
+        ActionWasChallenged: "_on_action_was_challenged",
+        BlockWasChallenged: "_on_block_was_challenged",
+    }
+
+    def _find_handler(self, command_type: type[Command]) -> Callable[[Command], Response | None] | None:
+        # Subclasses of a handled command use the closest handled base, like the isinstance checks used to
+        for base in command_type.__mro__[1:]:
+            if base in self._handlers:
+                self._handlers[command_type] = self._handlers[base]
+                return self._handlers[base]
+        return None
 
     def run_command(self, command: Command) -> Response | None:
-        # Setup and meta
-        if isinstance(command, DebugMessage):
-            debug_print(command.message)
-        elif isinstance(command, Shutdown):
-            self.connection.close()
-            self.logic.shutdown()
-            self.running = False
-        elif isinstance(command, AskName):
-            return NameResponse(self.logic.ask_name()
-                                .replace(PARAM_SPLITTER, CONTROL_CHAR_REPLACE)
-                                .replace(COMMAND_END, CONTROL_CHAR_REPLACE))
-        elif isinstance(command, AddOpponent):
-            self.opponents[command.number] = MutableOpponentState(command.number, command.player_name)
-            self.logic.add_opponent(command.number, command.player_name)
-        elif isinstance(command, SetPlayerNumber):
-            self.number = command.number
-            self.logic.set_player_number(command.number)
-        elif isinstance(command, NewGame):
-            self.reset_state()
-            self.logic.new_game()
-
-        # State changes
-        elif isinstance(command, AddCard):
-            self.cards.append(command.card)
-            self.logic.add_card(command.card)
-        elif isinstance(command, ChangeMoney):
-            self.money += command.amount
-            self.logic.change_money(command.amount)
-        elif isinstance(command, RemoveCard):
-            self.cards.remove(command.card)
-            self.logic.remove_card(command.card)
-        elif isinstance(command, PlayerLostACard):
-            if command.player in self.opponents:
-                opp = self.opponents[command.player]
-                opp.cards_amount -= 1
-                opp.dead_cards.append(command.card)
-            self.logic.player_lost_a_card(command.player, command.card)
-        elif isinstance(command, MoneyChanged):
-            if command.player in self.opponents:
-                self.opponents[command.player].money += command.amount
-            self.logic.money_changed(command.player, command.amount)
-        elif isinstance(command, PlayerViolatedRules):
-            if command.number in self.opponents:
-                self.opponents.pop(command.number)
-            self.logic.a_player_violated_rules(command.number)
-
-        # Card decisions
-        elif isinstance(command, ChooseCardToKill):
-            return self.logic.choose_card_to_kill()
-        elif isinstance(command, ChooseAmbassadorCardsToRemove):
-            return self.logic.choose_ambassador_cards_to_remove()
-
-        # Turn flow
-        elif isinstance(command, TakeTurn):
-            return self.logic.take_turn()
-        elif isinstance(command, YourActionIsChallenged):
-            return self.logic.your_action_is_challenged(command.action, command.target, command.challenger)
-        elif isinstance(command, YourBlockIsChallenged):
-            return self.logic.your_block_is_challenged(command.action, command.action_doer, command.block_card,
-                                                       command.challenger)
-        elif isinstance(command, DoYouBlock):
-            return self.logic.do_you_block(command.action, command.action_doer)
-        elif isinstance(command, DoYouChallengeAction):
-            return self.logic.do_you_challenge_action(command.action, command.action_doer, command.target)
-        elif isinstance(command, DoYouChallengeBlock):
-            return self.logic.do_you_challenge_block(command.action, command.action_doer, command.target,
-                                                     command.block_card, command.blocked_by)
-
-        # Log
-        elif isinstance(command, ActionWasTaken):
-            self.logic.action_was_taken(command.action, command.action_doer, command.target)
-        elif isinstance(command, ActionWasBlocked):
-            self.logic.action_was_blocked(command.action, command.action_doer, command.target, command.block_card,
-                                          command.blocked_by)
-        elif isinstance(command, ActionWasChallenged):
-            self.logic.action_was_challenged(command.action, command.action_doer, command.target, command.challenger,
-                                             command.success)
-        elif isinstance(command, BlockWasChallenged):
-            self.logic.block_was_challenged(command.action, command.action_taker, command.target, command.block_card,
-                                            command.blocked_by, command.challenger, command.success)
-        else:
-            print("Unknown command", command)
+        handler = self._handlers.get(type(command)) or self._find_handler(type(command))
+        if handler is None:
+            client_log.warning("Unknown command %s", command)
+            return None
+        return handler(command)
 
     def run(self):
         while self.running:
-            data = self.connection.receive()
-            debug_print(f"# RAW DATA RECEIVED: {data}")
-            if not len(data):
+            try:
+                command = self.connection.receive_message(Command)
+            except EOFError:
                 break
+            if protocol_log.isEnabledFor(logging.DEBUG):
+                protocol_log.debug("# RECEIVED: %s", None if command is None else command.serialize())
+
+            response = self.run_command(command)
+            if response is not None:
+                self.connection.send(response)
+
+
+class AsyncPlayerClient(PlayerClient):
+    # PlayerClient over an AsyncConnection, so many seats can share one event loop. The logic stays synchronous.
+
+    def __init__(self, connection: AsyncConnection, logic: ClientLogic):
+        super().__init__(connection, logic)
+        self.connection: AsyncConnection = connection
+
+    def shutdown(self):
+        # The connection is closed by run once the loop ends
+        self.logic.shutdown()
+        self.running = False
 
-            commands = [c for c in data.split(COMMAND_END) if c]
+    async def run(self):
+        try:
+            while self.running:
+                frame = await self.connection.receive_frame()
+                protocol_log.debug("# RAW DATA RECEIVED: %s", frame)
+                if not len(frame):
+                    break
 
-            for serialized_command in commands:
-                command = Command.deserialize(serialized_command)
-                response = self.run_command(command)
+                response = self.run_command(self.connection.codec.decode(frame, Command))
                 if response is not None:
-                    self.connection.send(response)
+                    await self.connection.send(response)
+        finally:
+            await self.connection.close()
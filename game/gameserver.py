@@ -1,9 +1,17 @@
 import random
+import time
+from collections import Counter
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 
-from common.common import debug_print
-from config import EACH_CARD_IN_DECK, WRONG_MESSAGE_TOLERANCE, START_MONEY, START_CARDS_AMOUNT
+from common.common import server_log
+from config import EACH_CARD_IN_DECK, WRONG_MESSAGE_TOLERANCE, START_MONEY, START_CARDS_AMOUNT, GAMES_AMOUNT, \
+    DECISION_TIMEOUT, TIME_BANK, HANDSHAKE_TIMEOUT
 from connection.common import Connection
+from game.deck import Deck
+from game.eventlog import EventLog
+from game.instrumentation import Instrumentation, GameStats
 from game.messages.commands import *
 from game.messages.responses import *
 
@@ -12,29 +20,136 @@ class TurnEndPanic(Exception):
     def __init__(self):
         super().__init__()
 
+
+# Marks that a response has not been asked beforehand
+_NOT_ASKED = object()
+
+
+@dataclass
+class MatchResult:
+    games: int = 0
+    # Games won by each player number. Games without a winner are counted only in games.
+    wins: dict[int, int] = field(default_factory=dict)
+    names: dict[int, str] = field(default_factory=dict)
+    # Amount of games by their length in turns
+    game_lengths: Counter[int] = field(default_factory=Counter)
+    # Amount of attempted actions by action name
+    actions: Counter[str] = field(default_factory=Counter)
+
+    def win_rate(self, number: int) -> float:
+        return self.wins.get(number, 0) / self.games if self.games else 0.0
+
+    def average_game_length(self) -> float:
+        turns = sum(length * amount for length, amount in self.game_lengths.items())
+        return turns / self.games if self.games else 0.0
+
+    def merge(self, other: 'MatchResult'):
+        self.games += other.games
+        for number, wins in other.wins.items():
+            self.wins[number] = self.wins.get(number, 0) + wins
+        self.names.update(other.names)
+        self.game_lengths.update(other.game_lengths)
+        self.actions.update(other.actions)
+
+    def __str__(self):
+        return "\n".join([f"{self.games} games played"] + [
+            f"{number}:{name} won {self.wins.get(number, 0)} ({self.win_rate(number):.1%})"
+            for number, name in self.names.items()])
+
+
 class Player:
-    def __init__(self, number: int, connection: Connection):
+    __slots__ = ("cards", "money", "_connection", "_outbox", "name", "number", "decision_timeout", "time_bank_per_game",
+                 "time_bank", "_timeout", "instrumentation", "aborted")
+
+    def __init__(self, number: int, connection: Connection, decision_timeout: float | None = None,
+                 time_bank: float | None = None):
         self.cards: list[Card] = []
         self.money: int = 0
         self._connection: Connection = connection
+        # Commands are queued and written in one go before the next request to this player, or at the end of a turn
+        self._outbox: list[Command] = []
         self.name: str = ""
         self.number: int = number
+        # Like a chess clock, time spent on answering is taken from the time bank, which is refilled every game
+        self.decision_timeout = decision_timeout
+        self.time_bank_per_game = time_bank
+        self.time_bank = time_bank
+        self._timeout = None
+        self.instrumentation: Instrumentation | None = None
+        # Set when a request to the player was given up on. Nothing is sent to the player after that, and any
+        # further request times out.
+        self.aborted = False
 
     def __eq__(self, other: 'Player'):
         return self.number == other.number
 
     def send(self, msg: Command):
-        self._connection.send(msg)
+        self._outbox.append(msg)
+
+    def flush(self):
+        if self._outbox and self.aborted:
+            self._outbox = []
+        elif self._outbox:
+            outbox = self._outbox
+            self._outbox = []
+            if self.instrumentation is None:
+                self._connection.send_many(outbox)
+            else:
+                sent = self._connection.bytes_sent
+                self._connection.send_many(outbox)
+                self.instrumentation.sent(self.number, self._connection.bytes_sent - sent)
 
     def send_and_receive(self, msg: Command, response_type: type[Response]) -> Response:
-        res = self._connection.send_and_receive(msg)
-        return response_type.deserialize(res)
+        if self.aborted:
+            raise TimeoutError()
+        if self.time_bank is None:
+            self._set_timeout(self.decision_timeout)
+        else:
+            if self.time_bank <= 0:
+                raise TimeoutError()
+            timeout = self.time_bank if self.decision_timeout is None else min(self.decision_timeout, self.time_bank)
+            self._set_timeout(timeout)
+            self.send(TimeBankLeft(int(self.time_bank * 1000)))
+        self.flush()
+        if self.time_bank is None and self.instrumentation is None:
+            return self._connection.send_and_receive_response(msg, response_type)
+
+        sent, received = self._connection.bytes_sent, self._connection.bytes_received
+        start = time.perf_counter()
+        try:
+            return self._connection.send_and_receive_response(msg, response_type)
+        finally:
+            elapsed = time.perf_counter() - start
+            if self.instrumentation is not None:
+                self.instrumentation.request(self.number, type(msg).__name__, elapsed,
+                                             self._connection.bytes_sent - sent,
+                                             self._connection.bytes_received - received)
+            if self.time_bank is not None:
+                # Connections that cannot time out are caught here after the fact
+                self.time_bank -= elapsed
+                if self.time_bank <= 0:
+                    raise TimeoutError()
+
+    def _set_timeout(self, seconds: float | None):
+        if seconds != self._timeout:
+            self._timeout = seconds
+            self._connection.set_timeout(seconds)
+
+    def refill_time_bank(self):
+        self.time_bank = self.time_bank_per_game
 
     def __str__(self):
         return f"{self.number}:{self.name}"
 
+    def abort(self):
+        # Ends a request to this player that is still running in another thread
+        self.aborted = True
+        self._connection.abort()
+
     def shutdown(self):
-        self.send(Shutdown())
+        if not self.aborted:
+            self.send(Shutdown())
+            self.flush()
         self._connection.close()
 
     def give_card(self, c: Card):
@@ -50,65 +165,175 @@ class Player:
         self.send(ChangeMoney(m))
 
     def debug_message(self, msg: str):
-        self._connection.send(DebugMessage(msg))
+        self.send(DebugMessage(msg))
+
+    def reset(self):
+        # Server side only. The client resets its own state when it gets NewGame.
+        self.cards = []
+        self.money = 0
 
 
 class Game:
-    def __init__(self, connections: list[Connection], deck: list[Card] | None = None, crash_on_violation: bool = False):
-        self.all_players: dict[int, Player] = {i: Player(i, c) for i, c in enumerate(connections)}
+    def __init__(self, connections: list[Connection], deck: list[Card] | None = None, crash_on_violation: bool = False,
+                 rng: random.Random | int | None = None, event_log: EventLog | None = None,
+                 concurrent_queries: bool = False, query_timeout: float | None = None,
+                 decision_timeout: float | None = DECISION_TIMEOUT, time_bank: float | None = TIME_BANK,
+                 instrumentation: Instrumentation | None = None, handshake_timeout: float | None = HANDSHAKE_TIMEOUT):
+        # All randomness of the game comes from rng, so a seed and the players' decisions replay a game exactly
+        self.rng: random.Random = rng if isinstance(rng, random.Random) else random.Random(rng)
+        self.all_players: dict[int, Player] = {i: Player(i, c, decision_timeout, time_bank)
+                                               for i, c in enumerate(connections)}
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.add_players(list(self.all_players))
+            for p in self.all_players.values():
+                p.instrumentation = instrumentation
         self.rule_abiding_players: dict[int, Player] = {p: self.all_players[p] for p in self.all_players}
         self.alive_players: dict[int, Player] = {p: self.all_players[p] for p in self.all_players}
-        for p in self.all_players.values():
-            p.send(SetPlayerNumber(p.number))
-            name = self._extort_a_response(p, AskName(), NameResponse)
-            if name is not None:
-                p.name = name.player_name
-        debug_print(f"Players {[p.name for p in self.all_players.values()]} joined.")
-        self.deck = []
-        if deck is None:
-            for c in Card.all():
-                self.deck.extend(EACH_CARD_IN_DECK * [c])
-        else:
-            self.deck = deck
+        self._initial_deck = None if deck is None else list(deck)
+        self.deck = self._new_deck()
         self.crash_on_violation = crash_on_violation
+        self.event_log = event_log
+        # In concurrent mode, the block and challenge questions of one step are sent to all players at once. The
+        # answers are still applied in the same order as in the sequential mode, so the rules do not change, but
+        # players after the first blocker or challenger are asked too.
+        self.concurrent_queries = concurrent_queries
+        self.query_timeout = query_timeout
+        self._query_executor = ThreadPoolExecutor(max_workers=len(connections)) if concurrent_queries else None
+        self.turns_played = 0
+        self.actions_attempted: Counter[str] = Counter()
+        # Last, as players who fail it are killed like in a game
+        self._handshake(handshake_timeout)
+        server_log.debug("Players %s joined.", [p.name for p in self.all_players.values()])
+
+    @property
+    def deck(self) -> Deck:
+        return self._deck
+
+    @deck.setter
+    def deck(self, cards: list[Card]):
+        # Any list of cards can be set as the deck, e.g. a fixed one in tests
+        self._deck = cards if isinstance(cards, Deck) else Deck(cards, self.rng)
+
+    def _new_deck(self) -> list[Card]:
+        if self._initial_deck is not None:
+            return list(self._initial_deck)
+        deck = []
+        for c in Card.all():
+            deck.extend(EACH_CARD_IN_DECK * [c])
+        return deck
+
+    def new_game(self, starting_seat: int = 0):
+        # Resets the table for another game with the same connections. Players who violated rules stay out.
+        self.deck = self._new_deck()
+        self.turns_played = 0
+        self.actions_attempted = Counter()
+        seats = list(self.rule_abiding_players)
+        starting_seat %= len(seats)
+        self.alive_players = {n: self.rule_abiding_players[n] for n in seats[starting_seat:] + seats[:starting_seat]}
+        for p in self.rule_abiding_players.values():
+            p.reset()
+            p.send(NewGame())
+
+    def _broadcast(self, msg: Command):
+        # The same message object goes to everyone, so it is serialized only once
+        for p in self.rule_abiding_players.values():
+            p.send(msg)
+
+    def _flush_all(self):
+        for p in self.rule_abiding_players.values():
+            p.flush()
 
     def _mark_player_dead(self, player: Player):
         self.alive_players.pop(player.number)
 
     def _mark_player_illegal(self, player: Player):
-        for p in self.rule_abiding_players.values():
-            p.send(PlayerViolatedRules(player.number))
+        if self.event_log is not None:
+            self.event_log.rule_violation(player.number)
+        self._broadcast(PlayerViolatedRules(player.number))
         self.rule_abiding_players.pop(player.number)
         self.alive_players.pop(player.number)
 
     def _emergency_kill(self, player: 'Player'):
-        debug_print(f"Player {player.number} died because of rule violations")
+        server_log.debug("Player %s died because of rule violations", player.number)
         if self.crash_on_violation:
             raise Exception("Crashing on rule violation")
         self._mark_player_illegal(player)
         for c in player.cards.copy():
             player.remove_card(c)
-            for p in self.rule_abiding_players.values():
-                p.send(PlayerLostACard(player.number, c))
+            self._log_card_loss(player, c)
 
-    def _extort_a_response[R](self, player: Player, command: Command, response_type: type[R], extra_condition: Callable[[R], bool] | None = None) -> R | None:
+    def _extort_a_response[R](self, player: Player, command: Command, response_type: type[R], extra_condition: Callable[[R], bool] | None = None,
+                              prefetched: R | None | TimeoutError = _NOT_ASKED) -> R | None:
         try:
-            for _ in range(WRONG_MESSAGE_TOLERANCE):
-                result = player.send_and_receive(command, response_type)
-                if result is None:
-                    continue
-                if extra_condition is not None and not extra_condition(result):
+            for attempt in range(WRONG_MESSAGE_TOLERANCE):
+                if attempt == 0 and prefetched is not _NOT_ASKED:
+                    if isinstance(prefetched, TimeoutError):
+                        raise prefetched
+                    result = prefetched
+                else:
+                    result = player.send_and_receive(command, response_type)
+                if result is None or (extra_condition is not None and not extra_condition(result)):
+                    if self.instrumentation is not None:
+                        self.instrumentation.retry(player.number, type(command).__name__)
                     continue
                 return result
         except TimeoutError:
-            debug_print(f"Player {player.number} took too long and timed out")
+            server_log.debug("Player %s took too long and timed out", player.number)
         self._emergency_kill(player)
         return None
 
+    def _handshake(self, timeout: float | None):
+        # All players are told their number and asked their name at once, so a slow player only delays the start by
+        # its own answer, and no one by more than the timeout
+        players = list(self.all_players.values())
+        for p in players:
+            p.send(SetPlayerNumber(p.number))
+        answers = {}
+        if len(players) > 1:
+            executor = ThreadPoolExecutor(max_workers=len(players))
+            answers = self._ask_at_once(executor, players, AskName(), NameResponse, timeout)
+            # Players who missed the deadline were cut off, so no request is left running
+            executor.shutdown()
+        for p in players:
+            name = self._extort_a_response(p, AskName(), NameResponse, prefetched=answers.get(p.number, _NOT_ASKED))
+            if name is not None:
+                p.name = name.player_name
+
+    def _prefetch_responses[R](self, players: list[Player], command: Command, response_type: type[R]) -> dict[int, R | None | TimeoutError]:
+        # Concurrent mode: sends the command to all players at once, and collects their first answers by player number.
+        # The answers are then given to _extort_a_response as prefetched, which asks again if they are not valid.
+        if self._query_executor is None or len(players) < 2:
+            return {}
+        self._flush_all()
+        return self._ask_at_once(self._query_executor, players, command, response_type, self.query_timeout)
+
+    @staticmethod
+    def _ask_at_once[R](executor: ThreadPoolExecutor, players: list[Player], command: Command, response_type: type[R],
+                        timeout: float | None) -> dict[int, R | None | TimeoutError]:
+        futures = {p.number: executor.submit(p.send_and_receive, command, response_type) for p in players}
+        done, late = wait(futures.values(), timeout=timeout)
+        if late:
+            # A late answer must not be read by a request still running once the game goes on, nor change the
+            # player's time bank or statistics then. So the late players are cut off, and their requests are let to
+            # finish first. They count as timed out from then on.
+            stragglers = [p for p in players if futures[p.number] in late]
+            for p in stragglers:
+                p.abort()
+            wait(late)
+            for p in stragglers:
+                p.shutdown()
+        results = {}
+        for number, future in futures.items():
+            if future in late or isinstance(future.exception(), TimeoutError):
+                results[number] = TimeoutError()
+            else:
+                results[number] = future.result()
+        return results
+
     def _setup_player(self, player: Player):
-        random.shuffle(self.deck)
         for _ in range(START_CARDS_AMOUNT):
-            player.give_card(self.deck.pop())
+            player.give_card(self.deck.draw())
         player.give_money(START_MONEY)
         for other in self.rule_abiding_players.values():
             if player.number != other.number:
@@ -116,7 +341,9 @@ class Game:
 
     def setup_players(self):
         for p in self.rule_abiding_players.values():
+            p.refill_time_bank()
             self._setup_player(p)
+        self._flush_all()
 
     def _get_other_players_than(self, num: int) -> dict[int, Player]:
         return {n: p for (n, p) in self.alive_players.items() if p.number != num}
@@ -135,14 +362,17 @@ class Game:
                 raise TurnEndPanic()
         else:
             player.remove_card(card_response.card)
-
-            for p in self.rule_abiding_players.values():
-                p.send(PlayerLostACard(player.number, card_response.card))
+            self._log_card_loss(player, card_response.card)
 
             if not player.cards:
                 self._mark_player_dead(player)
 
 
+    def _log_card_loss(self, player: Player, card: Card):
+        if self.event_log is not None:
+            self.event_log.card_loss(player.number, card)
+        self._broadcast(PlayerLostACard(player.number, card))
+
     def _handle_challenges(self, player: Player, action: ActionDecision):
         if not action.action().requires_card:
             # Cannot be challenged
@@ -154,24 +384,28 @@ class Game:
         other_players = self._get_other_players_than(player.number)
         other_numbers = list(other_players)
         # Random order of challenging, to lessen the effect of player order
-        random.shuffle(other_numbers)
+        self.rng.shuffle(other_numbers)
         target_num = -1
         if isinstance(action, TargetedActionDecision):
             target_num = action.target()
             # Put target first
             other_numbers = [action.target()] + [n for n in other_numbers if n != action.target()]
 
+        question = DoYouChallengeAction(action.action(), player.number, target_num)
+        prefetched = self._prefetch_responses([other_players[n] for n in other_numbers], question, DoYouChallengeDecision)
+
         for other_num in other_numbers:
             challenger = other_players[other_num]
 
-            challenge = self._extort_a_response(challenger, DoYouChallengeAction(action.action(), player.number, target_num), DoYouChallengeDecision)
+            challenge = self._extort_a_response(challenger, question, DoYouChallengeDecision,
+                                                prefetched=prefetched.get(other_num, _NOT_ASKED))
 
             # If target somehow died while answering, return but don't panic
             if action.action().targeted and target_num not in self.alive_players:
                 return
 
             if isinstance(challenge, Challenge):
-                debug_print(f"It is challenged by {challenger.number}")
+                server_log.debug("It is challenged by %s", challenger.number)
 
                 def check_challenged_decision(decision: YouAreChallengedDecision):
                     if isinstance(decision, RevealCard) and required_card not in player.cards:
@@ -190,15 +424,14 @@ class Game:
                     challenge_success = False
                     life_loser = challenger
                     player.remove_card(required_card)
-                    self.deck.append(required_card)
-                    random.shuffle(self.deck)
-                    player.give_card(self.deck.pop())
-                    debug_print("Challenge unsuccessful")
+                    self.deck.put_back(required_card)
+                    player.give_card(self.deck.draw())
+                    server_log.debug("Challenge unsuccessful")
 
                 else:
                     challenge_success = True
                     life_loser = player
-                    debug_print("Challenge successful")
+                    server_log.debug("Challenge successful")
 
                 self._choose_and_kill_a_card(life_loser, life_loser == player or life_loser.number == target_num)
 
@@ -210,10 +443,11 @@ class Game:
                 return
 
     def _log_challenge_result(self, player: Player, action: Action, target_num: int, challenger_num: int, successful: bool):
-        debug_print(
-            f"{action} challenged by {challenger_num} with success {successful}. Taken by {player.number} on {target_num}")
-        for p in self.rule_abiding_players.values():
-            p.send(ActionWasChallenged(action, player.number, target_num, challenger_num, successful))
+        server_log.debug("%s challenged by %s with success %s. Taken by %s on %s", action, challenger_num, successful,
+                         player.number, target_num)
+        if self.event_log is not None:
+            self.event_log.challenge(player.number, action, target_num, challenger_num, successful)
+        self._broadcast(ActionWasChallenged(action, player.number, target_num, challenger_num, successful))
 
     def _handle_blocks(self, player: Player, action: ActionDecision):
         if not action.action().blocked_by:
@@ -223,29 +457,37 @@ class Game:
         other_players = self._get_other_players_than(player.number)
         other_numbers = list(other_players)
         # Random order of challenging, to lessen the effect of player order
-        random.shuffle(other_numbers)
+        self.rng.shuffle(other_numbers)
         target_num = -1
         if isinstance(action, TargetedActionDecision):
             # If targeted, only ask block from the targeted player
             target_num = action.target()
             other_numbers = [action.target()]
 
+        question = DoYouBlock(action.action(), player.number)
+        prefetched = self._prefetch_responses([other_players[n] for n in other_numbers], question, DoYouBlockDecision)
+
         for other_num in other_numbers:
             blocker_player = other_players[other_num]
-            block_decision = self._extort_a_response(blocker_player, DoYouBlock(action.action(), player.number), DoYouBlockDecision)
+            block_decision = self._extort_a_response(blocker_player, question, DoYouBlockDecision,
+                                                     prefetched=prefetched.get(other_num, _NOT_ASKED))
 
             if isinstance(block_decision, Block):
-                debug_print(f"It is blocked by {other_num}")
+                server_log.debug("It is blocked by %s", other_num)
                 self._handle_block_challenges(player, action.action(), target_num, block_decision.card, blocker_player.number)
                 return
 
     def _handle_block_challenges(self, player: Player, action: Action, target_num: int, block_card: Card, blocker_number: int):
         possible_challengers = self._get_other_players_than(blocker_number)
 
+        question = DoYouChallengeBlock(action, player.number, target_num, block_card, blocker_number)
+        prefetched = self._prefetch_responses(list(possible_challengers.values()), question, DoYouChallengeDecision)
+
         for other_num in possible_challengers:
             challenger = self.alive_players[other_num]
 
-            challenge_decision = self._extort_a_response(challenger, DoYouChallengeBlock(action, player.number, target_num, block_card, blocker_number), DoYouChallengeDecision)
+            challenge_decision = self._extort_a_response(challenger, question, DoYouChallengeDecision,
+                                                         prefetched=prefetched.get(other_num, _NOT_ASKED))
 
             # Only the action doer may affect the action here, as either there is no target, or the target is not
             # a possible challenger anyway
@@ -253,7 +495,7 @@ class Game:
                 raise TurnEndPanic()
 
             if isinstance(challenge_decision, Challenge):
-                debug_print(f"The block is challenged by {other_num}")
+                server_log.debug("The block is challenged by %s", other_num)
                 blocker_player = self.alive_players[blocker_number]
 
                 def check_challenged_decision(decision: YouAreChallengedDecision):
@@ -273,15 +515,14 @@ class Game:
                     challenge_success = False
                     life_loser = challenger
                     blocker_player.remove_card(block_card)
-                    self.deck.append(block_card)
-                    random.shuffle(self.deck)
-                    blocker_player.give_card(self.deck.pop())
-                    debug_print("Block challenge unsuccessful")
+                    self.deck.put_back(block_card)
+                    blocker_player.give_card(self.deck.draw())
+                    server_log.debug("Block challenge unsuccessful")
 
                 else:
                     challenge_success = True
                     life_loser = blocker_player
-                    debug_print("Block challenge successful")
+                    server_log.debug("Block challenge successful")
 
                 self._choose_and_kill_a_card(life_loser, life_loser == player)
 
@@ -300,18 +541,21 @@ class Game:
         raise TurnEndPanic()
 
     def _log_block_result(self, player: Player, action: Action, target_num: int, blocked_with: Card, blocked_by: int):
-        debug_print(f"{action} blocked with {blocked_with} by {blocked_by}. Taken by {player.number} on {target_num}")
-        for p in self.rule_abiding_players.values():
-            p.send(ActionWasBlocked(action, player.number, target_num, blocked_with, blocked_by))
+        server_log.debug("%s blocked with %s by %s. Taken by %s on %s", action, blocked_with, blocked_by, player.number,
+                         target_num)
+        if self.event_log is not None:
+            self.event_log.block(player.number, action, target_num, blocked_with, blocked_by)
+        self._broadcast(ActionWasBlocked(action, player.number, target_num, blocked_with, blocked_by))
 
     def _log_block_challenge_result(self, player: Player, action: Action, target_num: int, blocked_with: Card, blocker_num: int,
                                     challenger_num: int, successful: bool):
-        debug_print(
-            f"Blocking with {blocked_with} by {blocker_num} the {action} taken by {player.number} on {target_num} challenged by {challenger_num} with success {successful}")
-        for p in self.rule_abiding_players.values():
-            p.send(
-                BlockWasChallenged(action, player.number, target_num, blocked_with, blocker_num, challenger_num,
-                                   successful))
+        server_log.debug("Blocking with %s by %s the %s taken by %s on %s challenged by %s with success %s", blocked_with,
+                         blocker_num, action, player.number, target_num, challenger_num, successful)
+        if self.event_log is not None:
+            self.event_log.block_challenge(player.number, action, target_num, blocked_with, blocker_num, challenger_num,
+                                           successful)
+        self._broadcast(BlockWasChallenged(action, player.number, target_num, blocked_with, blocker_num, challenger_num,
+                                           successful))
 
     def _handle_steal(self, player: Player, target_num: int):
         target_player = self.all_players[target_num]
@@ -344,9 +588,8 @@ class Game:
         self._log_successful_action_result(player, Coup(), target_player.number)
 
     def _handle_ambassadate(self, player: Player):
-        random.shuffle(self.deck)
-        player.give_card(self.deck.pop())
-        player.give_card(self.deck.pop())
+        player.give_card(self.deck.draw())
+        player.give_card(self.deck.draw())
 
         def check_response(r: AmbassadorCardResponse):
             if r.card1 == r.card2 and player.cards.count(r.card1) < 2:
@@ -365,22 +608,24 @@ class Game:
 
         player.remove_card(decision.card1)
         player.remove_card(decision.card2)
-        self.deck.append(decision.card1)
-        self.deck.append(decision.card2)
+        self.deck.put_back(decision.card1)
+        self.deck.put_back(decision.card2)
         self._log_successful_action_result(player, Ambassadate(), -1)
 
     def _money_change(self, player: Player, amount: int):
         player.give_money(amount)
-        for p in self.rule_abiding_players.values():
-            p.send(MoneyChanged(player.number, amount))
+        if self.event_log is not None:
+            self.event_log.money_change(player.number, amount)
+        self._broadcast(MoneyChanged(player.number, amount))
 
     def _log_successful_action_result(self, player: Player, action: Action, target_num: int):
-        debug_print(f"{action} taken by {player.number} on {target_num} successful")
-        for p in self.rule_abiding_players.values():
-            p.send(ActionWasTaken(action, player.number, target_num))
+        server_log.debug("%s taken by %s on %s successful", action, player.number, target_num)
+        if self.event_log is not None:
+            self.event_log.action(player.number, action, target_num)
+        self._broadcast(ActionWasTaken(action, player.number, target_num))
 
     def _take_action(self, player: Player):
-        debug_print(f"Player {player.number} taking turn")
+        server_log.debug("Player %s taking turn", player.number)
         other_players = self._get_other_players_than(player.number)
 
         def check_action_legality(action_decision: ActionDecision):
@@ -400,7 +645,8 @@ class Game:
         if action is None:
             raise TurnEndPanic()
 
-        debug_print(f"Player {player.number} attempting {action}")
+        server_log.debug("Player %s attempting %s", player.number, action)
+        self.actions_attempted[action.action().name] += 1
 
         self._handle_challenges(player, action)
 
@@ -437,6 +683,9 @@ class Game:
         taking_action_num = list(self.alive_players)[0]
         taking_action = self.alive_players.pop(taking_action_num)
         self.alive_players[taking_action_num] = taking_action
+        self.turns_played += 1
+        if self.instrumentation is not None:
+            self.instrumentation.turn(taking_action_num)
 
         try:
             self._take_action(taking_action)
@@ -445,18 +694,53 @@ class Game:
 
         newly_dead = [p for p in self.alive_players.values() if not len(p.cards)]
         for d in newly_dead:
-            debug_print(f"Player {d.number} is dead")
+            server_log.debug("Player %s is dead", d.number)
             self._mark_player_dead(d)
 
-        if len(self.alive_players) == 1:
-            debug_print(f"Winner is {list(self.alive_players)[0]}!")
-            for p in self.rule_abiding_players.values():
-                p.shutdown()
+        self._flush_all()
+
+        if len(self.alive_players) <= 1:
+            server_log.debug("Winner is %s!", next(iter(self.alive_players), None))
             return True
         return False
 
-    def run(self):
+    # Plays one game from setup to the end, and returns the winner if there is one
+    def play_game(self) -> Player | None:
+        if self.event_log is not None:
+            self.event_log.game_start(len(self.alive_players))
         self.setup_players()
-        while True:
-            if self.run_one_turn():
+        while not self.run_one_turn():
+            pass
+        winner = next(iter(self.alive_players.values()), None)
+        if self.event_log is not None:
+            self.event_log.game_end(-1 if winner is None else winner.number)
+        return winner
+
+    def shutdown_players(self):
+        for p in self.rule_abiding_players.values():
+            p.shutdown()
+        if self._query_executor is not None:
+            self._query_executor.shutdown(wait=False)
+
+    # Returns the statistics of the game if the game is instrumented
+    def run(self) -> GameStats | None:
+        self.play_game()
+        self.shutdown_players()
+        return None if self.instrumentation is None else self.instrumentation.stats
+
+    # Plays games back to back over the same connections, rotating the starting seat between games
+    def run_match(self, games: int = GAMES_AMOUNT) -> MatchResult:
+        result = MatchResult(names={p.number: p.name for p in self.all_players.values()})
+        for i in range(games):
+            if i:
+                self.new_game(starting_seat=i)
+            if len(self.rule_abiding_players) < 2:
                 break
+            winner = self.play_game()
+            result.games += 1
+            result.game_lengths[self.turns_played] += 1
+            result.actions.update(self.actions_attempted)
+            if winner is not None:
+                result.wins[winner.number] = result.wins.get(winner.number, 0) + 1
+        self.shutdown_players()
+        return result
@@ -0,0 +1,141 @@
+import bisect
+import json
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TextIO
+
+# Upper bounds of the latency histogram buckets in seconds. The last bucket has no upper bound.
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+@dataclass
+class LatencyHistogram:
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        # Upper bound of the bucket the percentile falls in, so at most one bucket off
+        wanted = p / 100 * self.count
+        seen = 0
+        for i, amount in enumerate(self.counts):
+            seen += amount
+            if amount and seen >= wanted:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max
+        return 0.0
+
+
+@dataclass
+class PlayerStats:
+    # Round trip latencies and retries caused by invalid responses, by command type
+    latency: dict[str, LatencyHistogram] = field(default_factory=dict)
+    retries: Counter[str] = field(default_factory=Counter)
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    turns: int = 0
+
+
+@dataclass
+class GameStats:
+    players: dict[int, PlayerStats] = field(default_factory=dict)
+
+    def __str__(self):
+        lines = []
+        for number, stats in self.players.items():
+            lines.append(f"Player {number}: {stats.turns} turns, {stats.bytes_sent} bytes sent, "
+                         f"{stats.bytes_received} bytes received")
+            for command, histogram in stats.latency.items():
+                lines.append(f"  {command}: {histogram.count} requests, mean {histogram.mean() * 1000:.2f} ms, "
+                             f"p99 {histogram.percentile(99) * 1000:.2f} ms, {stats.retries[command]} retries")
+        return "\n".join(lines)
+
+
+class StatsSink:
+    def record(self, record: dict):
+        raise NotImplementedError()
+
+    def close(self):
+        pass
+
+
+class InMemorySink(StatsSink):
+    # Counts the records by kind and command
+    def __init__(self):
+        self.counters: Counter[tuple[str, str]] = Counter()
+        # Concurrent queries record from several threads
+        self._lock = threading.Lock()
+
+    def record(self, record: dict):
+        with self._lock:
+            self.counters[record["kind"], record.get("command", "")] += 1
+
+
+class JsonlSink(StatsSink):
+    # Writes every record as one line of JSON
+    def __init__(self, file: TextIO):
+        self.file = file
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: str) -> 'JsonlSink':
+        return cls(open(path, "a"))
+
+    def record(self, record: dict):
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self.file.write(line)
+
+    def close(self):
+        self.file.close()
+
+
+class Instrumentation:
+    # Timing and traffic statistics of a game. Every measurement is also streamed to the sink, if there is one.
+
+    def __init__(self, sink: StatsSink | None = None):
+        self.stats = GameStats()
+        self.sink = sink
+
+    def add_players(self, players: list[int]):
+        # Stats for every player are made up front, as players may be measured from several threads at once
+        for number in players:
+            self.stats.players.setdefault(number, PlayerStats())
+
+    def request(self, player: int, command: str, seconds: float, bytes_sent: int, bytes_received: int):
+        stats = self.stats.players[player]
+        histogram = stats.latency.get(command)
+        if histogram is None:
+            histogram = stats.latency[command] = LatencyHistogram()
+        histogram.add(seconds)
+        stats.bytes_sent += bytes_sent
+        stats.bytes_received += bytes_received
+        if self.sink is not None:
+            self.sink.record({"kind": "request", "player": player, "command": command, "seconds": seconds,
+                              "bytes_sent": bytes_sent, "bytes_received": bytes_received})
+
+    def sent(self, player: int, bytes_sent: int):
+        # Notifications written outside of requests
+        self.stats.players[player].bytes_sent += bytes_sent
+
+    def retry(self, player: int, command: str):
+        self.stats.players[player].retries[command] += 1
+        if self.sink is not None:
+            self.sink.record({"kind": "retry", "player": player, "command": command})
+
+    def turn(self, player: int):
+        self.stats.players[player].turns += 1
+        if self.sink is not None:
+            self.sink.record({"kind": "turn", "player": player})
@@ -0,0 +1,105 @@
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from common.common import server_log
+from config import FRAMING_HANDSHAKE_TIMEOUT, CONCURRENT_QUERIES
+from connection.asynchronous import AsyncOpenSocket, BlockingConnection
+from game.gameserver import Game
+
+
+class Lobby:
+    # Seats arriving clients into tables of table_size players and runs the tables concurrently. Sockets are served
+    # by one event loop, and each table's Game runs in a worker thread through BlockingConnections.
+
+    def __init__(self, table_size: int, max_tables: int = 256, response_timeout: float | None = 10,
+                 latency_sink: Callable[[float], None] | None = None):
+        self.table_size = table_size
+        self.response_timeout = response_timeout
+        self.latency_sink = latency_sink
+        self.tables_started = 0
+        self.tables_finished = 0
+        self.tables_crashed = 0
+        self.port: int | None = None
+        self.started = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max_tables)
+        self._waiting: list[AsyncOpenSocket] = []
+        self._running_tables: set[asyncio.Task] = set()
+        self._all_tables_finished = asyncio.Event()
+        self._tables_to_run: int | None = None
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = AsyncOpenSocket(reader, writer)
+        try:
+            await connection.accept_length_prefix(FRAMING_HANDSHAKE_TIMEOUT)
+        except ConnectionError as e:
+            server_log.debug("Dropped a client during framing negotiation: %r", e)
+            await connection.close()
+            return
+        if self._all_tables_finished.is_set():
+            await connection.close()
+            return
+        # Clients may have left while they waited for a table
+        for gone in [c for c in self._waiting if c.closed]:
+            self._waiting.remove(gone)
+            await gone.close()
+        self._waiting.append(connection)
+        if len(self._waiting) < self.table_size:
+            return
+        if self._tables_to_run is not None and self.tables_started >= self._tables_to_run:
+            return
+
+        seated = self._waiting[:self.table_size]
+        del self._waiting[:self.table_size]
+        self.tables_started += 1
+        table = asyncio.create_task(self._run_table(seated))
+        self._running_tables.add(table)
+        table.add_done_callback(self._running_tables.discard)
+
+    async def _run_table(self, connections: list[AsyncOpenSocket]):
+        loop = asyncio.get_running_loop()
+        blocking = [BlockingConnection(c, loop, self.response_timeout, self.latency_sink) for c in connections]
+        try:
+            await loop.run_in_executor(self._executor, self._play, blocking)
+        except Exception as e:
+            server_log.warning("Table crashed: %r", e)
+            self.tables_crashed += 1
+            for c in connections:
+                await c.close()
+        self.tables_finished += 1
+        if self._tables_to_run is not None and self.tables_finished >= self._tables_to_run:
+            self._all_tables_finished.set()
+
+    def _play(self, connections: list[BlockingConnection]):
+        # The Game sets its decision timeout on the connections, so it must be the lobby's response timeout too
+        Game(connections, concurrent_queries=CONCURRENT_QUERIES, decision_timeout=self.response_timeout).run_match()
+
+    async def serve(self, host: str, port: int, tables: int | None = None):
+        # Serves forever, or until the given amount of tables have played their game
+        server = await asyncio.start_server(self._on_connect, host, port)
+        self.port = server.sockets[0].getsockname()[1]
+        await self._serve(server, tables)
+
+    async def serve_unix(self, path: str, tables: int | None = None):
+        if os.path.exists(path):
+            os.unlink(path)
+        await self._serve(await asyncio.start_unix_server(self._on_connect, path), tables)
+
+    async def _serve(self, server: asyncio.Server, tables: int | None):
+        self._tables_to_run = tables
+        self.started.set()
+        try:
+            async with server:
+                try:
+                    if tables is None:
+                        await server.serve_forever()
+                    else:
+                        await self._all_tables_finished.wait()
+                finally:
+                    # Leaving the server waits for every connection, so clients still waiting for a table are closed
+                    for connection in self._waiting:
+                        await connection.close()
+                    self._waiting.clear()
+        finally:
+            self._executor.shutdown(wait=False)
@@ -9,20 +9,23 @@ from game.messages.responses import YouAreChallengedDecision, ActionDecision, Do
     DoYouChallengeDecision, AssassinateDecision, IncomeDecision, \
     RevealCard, Concede, Block, NoBlock, Challenge, Allow, CardResponse, AmbassadorCardResponse
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OpponentState:
     number: int
     cards_amount: int
-    dead_cards: list[Card]
+    dead_cards: tuple[Card, ...]
     money: int
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ClientState:
     number: int
-    cards: list[Card]
-    dead_cards: list[Card]
+    # Tuples, as one state is given to the logic until it changes
+    cards: tuple[Card, ...]
+    dead_cards: tuple[Card, ...]
     money: int
     opponents: dict[int, OpponentState]
+    # Seconds left in this game's time bank, or None if there is no time bank
+    time_bank: float | None = None
 
     def alive_opponents(self) -> dict[int, OpponentState]:
         return {opp.number: opp for opp in self.opponents.values() if opp.cards_amount}
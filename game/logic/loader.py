@@ -0,0 +1,14 @@
+import importlib
+
+from game.logic.clients import ClientLogic
+
+
+def load_logic_class(spec: str) -> type[ClientLogic]:
+    # Spec is "module:Class", e.g. "game.logic.clients:ExtremelySimpleTestClient". The module is imported only here.
+    module_name, _, class_name = spec.partition(":")
+    if not module_name or not class_name:
+        raise ValueError(f"Logic must be given as module:Class, got {spec}")
+    logic_class = getattr(importlib.import_module(module_name), class_name)
+    if not isinstance(logic_class, type) or not issubclass(logic_class, ClientLogic):
+        raise TypeError(f"{spec} is not a ClientLogic class")
+    return logic_class
@@ -0,0 +1,166 @@
+import struct
+from abc import abstractmethod
+
+from game.enums.actions import ACTION_IDS
+from game.enums.cards import CARD_IDS
+from game.messages.commands import *
+from game.messages.common import ParseSubclassNameParameters, CoupMessage
+from game.messages.responses import *
+
+
+class Codec:
+    # Turns messages into the bytes of one frame and back. The client picks the codec with its framing hello.
+    hello: bytes
+
+    @abstractmethod
+    def encode(self, msg: CoupMessage) -> bytes:
+        raise NotImplementedError()
+
+    # Returns None if the data is not a well-formed message of the given type. Data may be a view into a receive
+    # buffer, so nothing may keep a reference to it.
+    @abstractmethod
+    def decode[M](self, data: bytes | memoryview, message_type: type[M]) -> M | None:
+        raise NotImplementedError()
+
+    # Decodes the message between start and end of a receive buffer
+    def decode_from[M](self, buffer: bytearray, start: int, end: int, message_type: type[M]) -> M | None:
+        return self.decode(memoryview(buffer)[start:end], message_type)
+
+
+class TextCodec(Codec):
+    # The PARAM_SPLITTER separated, COMMAND_END terminated protocol
+    hello = b"\x00LEN"
+
+    def encode(self, msg: CoupMessage) -> bytes:
+        return msg.serialize().encode("UTF-8")
+
+    def decode[M](self, data: bytes | memoryview, message_type: type[M]) -> M | None:
+        try:
+            return message_type.deserialize(str(data, "UTF-8"))
+        except UnicodeDecodeError:
+            return None
+
+    def decode_from[M](self, buffer: bytearray, start: int, end: int, message_type: type[M]) -> M | None:
+        # The text protocol is parsed from a str anyway, and copying a short message out is cheaper than a view
+        try:
+            return message_type.deserialize(buffer[start:end].decode("UTF-8"))
+        except UnicodeDecodeError:
+            return None
+
+
+# Field kinds of the binary layouts: "c" card, "a" action, "i" player number or money amount, "I" 32-bit integer,
+# "?" boolean and "s" text. Text takes the rest of the frame, so it can only be the last field.
+_FIELD_FORMATS = {"c": "B", "a": "B", "i": "h", "I": "i", "?": "?", "s": ""}
+
+# Opcode and field layout of every message. Opcodes are part of the protocol, so they are never reused or changed.
+BINARY_LAYOUTS: dict[type[ParseSubclassNameParameters], tuple[int, str]] = {
+    DebugMessage: (0, "s"),
+    Shutdown: (1, ""),
+    AskName: (2, ""),
+    AddOpponent: (3, "is"),
+    SetPlayerNumber: (4, "i"),
+    NewGame: (5, ""),
+    AddCard: (6, "c"),
+    ChangeMoney: (7, "i"),
+    RemoveCard: (8, "c"),
+    PlayerLostACard: (9, "ic"),
+    MoneyChanged: (10, "ii"),
+    TimeBankLeft: (11, "I"),
+    PlayerViolatedRules: (12, "i"),
+    ChooseCardToKill: (13, ""),
+    ChooseAmbassadorCardsToRemove: (14, ""),
+    TakeTurn: (15, ""),
+    YourActionIsChallenged: (16, "aii"),
+    YourBlockIsChallenged: (17, "aici"),
+    DoYouBlock: (18, "ai"),
+    DoYouChallengeAction: (19, "aii"),
+    DoYouChallengeBlock: (20, "aiici"),
+    ActionWasTaken: (21, "aii"),
+    ActionWasBlocked: (22, "aiici"),
+    ActionWasChallenged: (23, "aiii?"),
+    BlockWasChallenged: (24, "aiicii?"),
+
+    NameResponse: (64, "s"),
+    IncomeDecision: (65, ""),
+    ForeignAidDecision: (66, ""),
+    TaxDecision: (67, ""),
+    AmbassadateDecision: (68, ""),
+    AssassinateDecision: (69, "i"),
+    StealDecision: (70, "i"),
+    CoupDecision: (71, "i"),
+    RevealCard: (72, ""),
+    Concede: (73, ""),
+    Challenge: (74, ""),
+    Allow: (75, ""),
+    Block: (76, "c"),
+    NoBlock: (77, ""),
+    CardResponse: (78, "c"),
+    AmbassadorCardResponse: (79, "cc"),
+}
+
+
+class _Layout:
+    __slots__ = ("message_type", "opcode", "fields", "text", "cards", "actions")
+
+    def __init__(self, message_type: type[ParseSubclassNameParameters], opcode: int, layout: str):
+        self.message_type = message_type
+        self.opcode = opcode
+        self.text = layout.endswith("s")
+        kinds = layout.rstrip("s")
+        # Opcode and the fixed size fields in one struct
+        self.fields = struct.Struct("!B" + "".join(_FIELD_FORMATS[k] for k in kinds))
+        self.cards = [i for i, k in enumerate(kinds) if k == "c"]
+        self.actions = [i for i, k in enumerate(kinds) if k == "a"]
+
+
+class BinaryCodec(Codec):
+    # One opcode byte, then the fields packed with struct. Only used with length-prefixed framing, as a text field
+    # ends with the frame.
+    hello = b"\x00BIN"
+
+    def __init__(self):
+        self._by_type = {t: _Layout(t, opcode, layout) for t, (opcode, layout) in BINARY_LAYOUTS.items()}
+        self._by_opcode: list[_Layout | None] = [None] * 256
+        for layout in self._by_type.values():
+            self._by_opcode[layout.opcode] = layout
+        self._cards = {i: c for c, i in CARD_IDS.items()}
+        self._actions = {i: a for a, i in ACTION_IDS.items()}
+
+    def encode(self, msg: CoupMessage) -> bytes:
+        layout = self._by_type[type(msg)]
+        values = msg.write_data_str_list()
+        text = values.pop().encode("UTF-8") if layout.text else b""
+        for i in layout.cards:
+            values[i] = CARD_IDS[values[i]]
+        for i in layout.actions:
+            values[i] = ACTION_IDS[values[i]]
+        # Some messages write their numbers as strings
+        return layout.fields.pack(layout.opcode, *map(int, values)) + text
+
+    def decode[M](self, data: bytes | memoryview, message_type: type[M]) -> M | None:
+        return self.decode_from(data, 0, len(data), message_type)
+
+    def decode_from[M](self, buffer: bytearray, start: int, end: int, message_type: type[M]) -> M | None:
+        # Unpacks the fields in place, only text fields are copied out
+        if start == end:
+            return None
+        layout = self._by_opcode[buffer[start]]
+        # Like deserialize, only messages of the asked type are accepted
+        if layout is None or not issubclass(layout.message_type, message_type) or end - start < layout.fields.size:
+            return None
+        try:
+            values = list(layout.fields.unpack_from(buffer, start))
+            for i in layout.cards:
+                values[i + 1] = self._cards[values[i + 1]]
+            for i in layout.actions:
+                values[i + 1] = self._actions[values[i + 1]]
+            if layout.text:
+                values.append(str(memoryview(buffer)[start + layout.fields.size:end], "UTF-8"))
+        except (KeyError, UnicodeDecodeError):
+            return None
+        return layout.message_type(*values[1:])
+
+
+TEXT = TextCodec()
+BINARY = BinaryCodec()
+CODECS: dict[bytes, Codec] = {codec.hello: codec for codec in (TEXT, BINARY)}
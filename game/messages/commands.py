@@ -6,10 +6,12 @@ from game.messages.common import ParseSubclassNameParameters
 
 
 class Command(ParseSubclassNameParameters, metaclass=ABCMeta):
-    pass
+    __slots__ = ()
 
 
 class NoParameterCommand(Command, metaclass=ABCMeta):
+    __slots__ = ()
+
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'NoParameterCommand':
         return cls()
@@ -23,6 +25,7 @@ class NoParameterCommand(Command, metaclass=ABCMeta):
 
 class DebugMessage(Command):
     message_name = "debug_msg"
+    __slots__ = ("message",)
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'DebugMessage':
@@ -37,14 +40,17 @@ class DebugMessage(Command):
 
 class Shutdown(NoParameterCommand):
     message_name = "shutdown"
+    __slots__ = ()
 
 
 class AskName(NoParameterCommand):
     message_name = "ask_name"
+    __slots__ = ()
 
 
 class AddOpponent(Command):
     message_name = "add_opponent"
+    __slots__ = ("number", "player_name")
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'AddOpponent':
@@ -60,6 +66,7 @@ class AddOpponent(Command):
 
 class SetPlayerNumber(Command):
     message_name = "set_player_number"
+    __slots__ = ("number",)
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'SetPlayerNumber':
@@ -73,6 +80,7 @@ class SetPlayerNumber(Command):
 
 class AddCard(Command):
     message_name = "add_card"
+    __slots__ = ("card",)
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'AddCard':
@@ -87,6 +95,7 @@ class AddCard(Command):
 
 class RemoveCard(Command):
     message_name = "remove_card"
+    __slots__ = ("card",)
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'RemoveCard':
@@ -101,6 +110,7 @@ class RemoveCard(Command):
 
 class ChangeMoney(Command):
     message_name = "change_money"
+    __slots__ = ("amount",)
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'ChangeMoney':
@@ -115,10 +125,12 @@ class ChangeMoney(Command):
 
 class NewGame(NoParameterCommand):
     message_name = "new_game"
+    __slots__ = ()
 
 
 class PlayerLostACard(Command):
     message_name = "player_lost_a_card"
+    __slots__ = ("player", "card")
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'PlayerLostACard':
@@ -133,6 +145,7 @@ class PlayerLostACard(Command):
 
 class MoneyChanged(Command):
     message_name = "money_changed"
+    __slots__ = ("player", "amount")
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'MoneyChanged':
@@ -146,8 +159,24 @@ class MoneyChanged(Command):
         self.amount = amount
 
 
+class TimeBankLeft(Command):
+    message_name = "time_bank_left"
+    __slots__ = ("milliseconds",)
+
+    @classmethod
+    def parse_from_params(cls, params: list[str]) -> 'TimeBankLeft':
+        return cls(int(params[0]))
+
+    def write_data_str_list(self) -> list[object]:
+        return [self.milliseconds]
+
+    def __init__(self, milliseconds: int):
+        self.milliseconds = milliseconds
+
+
 class PlayerViolatedRules(Command):
     message_name = "rules_violation"
+    __slots__ = ("number",)
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'PlayerViolatedRules':
@@ -162,18 +191,22 @@ class PlayerViolatedRules(Command):
 
 class ChooseCardToKill(NoParameterCommand):
     message_name = "choose_card_to_kill"
+    __slots__ = ()
 
 
 class ChooseAmbassadorCardsToRemove(NoParameterCommand):
     message_name = "choose_ambassador_cards"
+    __slots__ = ()
 
 
 class TakeTurn(NoParameterCommand):
     message_name = "take_turn"
+    __slots__ = ()
 
 
 class YourActionIsChallenged(Command):
     message_name = "your_action_is_challenged"
+    __slots__ = ("action", "target", "challenger")
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'YourActionIsChallenged':
@@ -190,6 +223,7 @@ class YourActionIsChallenged(Command):
 
 class YourBlockIsChallenged(Command):
     message_name = "your_block_is_challenged"
+    __slots__ = ("action", "action_doer", "block_card", "challenger")
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'YourBlockIsChallenged':
@@ -209,6 +243,7 @@ class YourBlockIsChallenged(Command):
 
 class DoYouBlock(Command):
     message_name = "do_you_block"
+    __slots__ = ("action", "action_doer")
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'DoYouBlock':
@@ -224,6 +259,7 @@ class DoYouBlock(Command):
 
 class DoYouChallengeAction(Command):
     message_name = "do_you_challenge_action"
+    __slots__ = ("action", "action_doer", "target")
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'DoYouChallengeAction':
@@ -240,6 +276,7 @@ class DoYouChallengeAction(Command):
 
 class DoYouChallengeBlock(Command):
     message_name = "do_you_challenge_block"
+    __slots__ = ("action", "action_doer", "target", "block_card", "blocked_by")
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'DoYouChallengeBlock':
@@ -259,6 +296,7 @@ class DoYouChallengeBlock(Command):
 
 class ActionWasTaken(Command):
     message_name = "log_action_was_taken"
+    __slots__ = ("action", "action_doer", "target")
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'ActionWasTaken':
@@ -275,6 +313,7 @@ class ActionWasTaken(Command):
 
 class ActionWasBlocked(Command):
     message_name = "log_action_was_blocked"
+    __slots__ = ("action", "action_doer", "target", "block_card", "blocked_by")
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'ActionWasBlocked':
@@ -294,6 +333,7 @@ class ActionWasBlocked(Command):
 
 class ActionWasChallenged(Command):
     message_name = "log_action_was_challenged"
+    __slots__ = ("action", "action_doer", "target", "challenger", "success")
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'ActionWasChallenged':
@@ -312,6 +352,7 @@ class ActionWasChallenged(Command):
 
 class BlockWasChallenged(Command):
     message_name = "log_block_was_challenged"
+    __slots__ = ("action", "action_taker", "target", "challenger", "success", "block_card", "blocked_by")
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'BlockWasChallenged':
@@ -4,6 +4,9 @@ from config import PARAM_SPLITTER, COMMAND_END
 
 
 class CoupMessage:
+    # Messages are created by the million in simulations, so every message class declares __slots__
+    __slots__ = ()
+
     @abstractmethod
     def serialize(self) -> str:
         raise NotImplementedError()
@@ -14,6 +17,21 @@ class CoupMessage:
 
 
 class ParseSubclassNameParameters(CoupMessage, metaclass=ABCMeta):
+    __slots__ = ("_serialized",)
+
+    # Every concrete message class by its message_name, filled in as the classes are created
+    _by_message_name: dict[str, type['ParseSubclassNameParameters']] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Abstract classes have message_name as an abstract property, named ones override it with a string
+        name = cls.__dict__.get("message_name")
+        if isinstance(name, str):
+            if name in ParseSubclassNameParameters._by_message_name:
+                raise TypeError(f"Message name {name} is used by both "
+                                f"{ParseSubclassNameParameters._by_message_name[name].__name__} and {cls.__name__}")
+            ParseSubclassNameParameters._by_message_name[name] = cls
+
     @classmethod
     def transitive_named_subclasses(cls):
         res = []
@@ -31,13 +49,14 @@ class ParseSubclassNameParameters(CoupMessage, metaclass=ABCMeta):
     @classmethod
     def deserialize(cls, serialized: str) -> 'ParseSubclassNameParameters | None':
         split = serialized.strip(COMMAND_END).split(PARAM_SPLITTER)
-        name = split[0]
-        for sub in cls.transitive_named_subclasses():
-            if sub.message_name == name:
-                try:
-                    return sub.parse_from_params(split[1:])
-                except (IndexError, ValueError):
-                    return None
+        sub = ParseSubclassNameParameters._by_message_name.get(split[0])
+        # Only messages of the asked type are accepted, e.g. a Command never parses as a Response
+        if sub is None or not issubclass(sub, cls):
+            return None
+        try:
+            return sub.parse_from_params(split[1:])
+        except (IndexError, ValueError):
+            return None
 
     @classmethod
     @abstractmethod
@@ -49,4 +68,10 @@ class ParseSubclassNameParameters(CoupMessage, metaclass=ABCMeta):
         raise NotImplementedError()
 
     def serialize(self) -> str:
-        return PARAM_SPLITTER.join([self.message_name] + [str(o) for o in self.write_data_str_list()]) + COMMAND_END
+        # Messages are not changed after creation, so a message broadcast to many players is serialized only once
+        serialized = getattr(self, "_serialized", None)
+        if serialized is None:
+            serialized = PARAM_SPLITTER.join(
+                [self.message_name] + [str(o) for o in self.write_data_str_list()]) + COMMAND_END
+            self._serialized = serialized
+        return serialized
@@ -6,11 +6,12 @@ from game.messages.common import ParseSubclassNameParameters
 
 
 class Response(ParseSubclassNameParameters, metaclass=ABCMeta):
-    pass
+    __slots__ = ()
 
 
 class NameResponse(Response):
     message_name = "name_response"
+    __slots__ = ("player_name",)
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'NameResponse':
@@ -24,12 +25,16 @@ class NameResponse(Response):
 
 
 class ActionDecision(Response, metaclass=ABCMeta):
+    __slots__ = ()
+
     @abstractmethod
     def action(self) -> Action:
         raise NotImplementedError()
 
 
 class TargetedActionDecision(ActionDecision):
+    __slots__ = ("_target",)
+
     def write_data_str_list(self) -> list[object]:
         return [self.target()]
 
@@ -53,6 +58,8 @@ class TargetedActionDecision(ActionDecision):
 
 
 class NonTargetedActionDecision(ActionDecision, metaclass=ABCMeta):
+    __slots__ = ()
+
     def write_data_str_list(self) -> list[object]:
         return []
 
@@ -69,6 +76,7 @@ class NonTargetedActionDecision(ActionDecision, metaclass=ABCMeta):
 
 class IncomeDecision(NonTargetedActionDecision):
     message_name = "income_decision"
+    __slots__ = ()
 
     def __init__(self):
         pass
@@ -79,6 +87,7 @@ class IncomeDecision(NonTargetedActionDecision):
 
 class ForeignAidDecision(NonTargetedActionDecision):
     message_name = "foreign_aid_decision"
+    __slots__ = ()
 
     def __init__(self):
         pass
@@ -89,6 +98,7 @@ class ForeignAidDecision(NonTargetedActionDecision):
 
 class TaxDecision(NonTargetedActionDecision):
     message_name = "tax_decision"
+    __slots__ = ()
 
     def __init__(self):
         pass
@@ -99,6 +109,7 @@ class TaxDecision(NonTargetedActionDecision):
 
 class AmbassadateDecision(NonTargetedActionDecision):
     message_name = "ambassadate_decision"
+    __slots__ = ()
 
     def __init__(self):
         pass
@@ -109,6 +120,7 @@ class AmbassadateDecision(NonTargetedActionDecision):
 
 class AssassinateDecision(TargetedActionDecision):
     message_name = "assassinate_decision"
+    __slots__ = ()
 
     def __init__(self, target: int):
         self._target: int = target
@@ -122,6 +134,7 @@ class AssassinateDecision(TargetedActionDecision):
 
 class StealDecision(TargetedActionDecision):
     message_name = "steal_decision"
+    __slots__ = ()
 
     def __init__(self, target: int):
         self._target = target
@@ -135,6 +148,7 @@ class StealDecision(TargetedActionDecision):
 
 class CoupDecision(TargetedActionDecision):
     message_name = "coup_decision"
+    __slots__ = ()
 
     def __init__(self, target: int):
         self._target = target
@@ -147,6 +161,8 @@ class CoupDecision(TargetedActionDecision):
 
 
 class YouAreChallengedDecision(Response, metaclass=ABCMeta):
+    __slots__ = ()
+
     def write_data_str_list(self) -> list[object]:
         return []
 
@@ -165,13 +181,17 @@ class RevealCard(YouAreChallengedDecision):
     # Because of turn flow structuring (block challenge) and coup rules (action challenge), there is always
     # only one card possible to reveal when this one is asked, so no card parameter is needed.
     message_name = "reveal_card"
+    __slots__ = ()
 
 
 class Concede(YouAreChallengedDecision):
     message_name = "concede"
+    __slots__ = ()
 
 
 class DoYouChallengeDecision(Response, metaclass=ABCMeta):
+    __slots__ = ()
+
     def __repr__(self):
         return f"{self.message_name}"
 
@@ -188,18 +208,21 @@ class DoYouChallengeDecision(Response, metaclass=ABCMeta):
 
 class Challenge(DoYouChallengeDecision):
     message_name = "challenge"
+    __slots__ = ()
 
 
 class Allow(DoYouChallengeDecision):
     message_name = "allow"
+    __slots__ = ()
 
 
 class DoYouBlockDecision(Response, metaclass=ABCMeta):
-    pass
+    __slots__ = ()
 
 
 class Block(DoYouBlockDecision):
     message_name = "block"
+    __slots__ = ("card",)
 
     def write_data_str_list(self) -> list[object]:
         return [self.card]
@@ -217,6 +240,7 @@ class Block(DoYouBlockDecision):
 
 class NoBlock(DoYouBlockDecision):
     message_name = "no_block"
+    __slots__ = ()
 
     def write_data_str_list(self) -> list[object]:
         return []
@@ -231,6 +255,7 @@ class NoBlock(DoYouBlockDecision):
 
 class CardResponse(Response):
     message_name = "card_message"
+    __slots__ = ("card",)
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'CardResponse':
@@ -245,6 +270,7 @@ class CardResponse(Response):
 
 class AmbassadorCardResponse(Response):
     message_name = "ambassador_card_message"
+    __slots__ = ("card1", "card2")
 
     @classmethod
     def parse_from_params(cls, params: list[str]) -> 'AmbassadorCardResponse':
@@ -0,0 +1,83 @@
+import argparse
+import random
+import time
+from collections.abc import Callable
+
+from common.common import set_debug
+from connection.common import Connection
+from game.gameclient import PlayerClient
+from game.eventlog import EventLog
+from game.gameserver import Game, MatchResult
+from game.logic.clients import ClientLogic
+from game.logic.loader import load_logic_class
+from game.messages.common import CoupMessage
+
+
+class NullConnection(Connection):
+    # The client side of a directly wired player. Nothing is ever sent over it.
+    def send(self, msg: CoupMessage):
+        pass
+
+    def receive(self) -> str:
+        return ""
+
+    def send_and_receive(self, msg: CoupMessage) -> str:
+        return ""
+
+    def close(self):
+        pass
+
+
+class DirectConnection(Connection):
+    # Passes message objects straight to a PlayerClient without serializing them, so the logic is trusted to build
+    # well-formed ones
+
+    def __init__(self, logic: ClientLogic):
+        self.client = PlayerClient(NullConnection(), logic)
+
+    def send(self, msg: CoupMessage):
+        self.client.run_command(msg)
+
+    def receive(self) -> str:
+        raise NotImplementedError("A direct connection is only used through send_and_receive_response")
+
+    def send_and_receive(self, msg: CoupMessage) -> str:
+        response = self.client.run_command(msg)
+        return response.serialize() if response is not None else ""
+
+    def send_and_receive_response[R](self, msg: CoupMessage, response_type: type[R]) -> R | None:
+        response = self.client.run_command(msg)
+        return response if isinstance(response, response_type) else None
+
+    def close(self):
+        pass
+
+
+def simulate(logic_factories: list[Callable[[], ClientLogic]], games: int, seed: int | None = None,
+             event_log: EventLog | None = None) -> MatchResult:
+    # Plays games in this process, one seat per logic factory, with debug output off
+    set_debug(False)
+    if seed is not None:
+        # The game has its own generator, this is for logics that use the global one
+        random.seed(seed)
+    game = Game([DirectConnection(factory()) for factory in logic_factories], rng=seed, event_log=event_log)
+    return game.run_match(games)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play games between logic classes in this process")
+    parser.add_argument("logics", nargs="+", metavar="module:Class", help="Logic class for each seat")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--event-log", default=None, help="File to append a binary log of the games to")
+    args = parser.parse_args()
+
+    factories = [load_logic_class(spec) for spec in args.logics]
+    event_log = EventLog.open(args.event_log) if args.event_log else None
+    start = time.perf_counter()
+    result = simulate(factories, args.games, args.seed, event_log)
+    elapsed = time.perf_counter() - start
+    if event_log is not None:
+        event_log.close()
+    print(result)
+    print(f"{result.games / elapsed:.0f} games/s")
@@ -0,0 +1,53 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game.gameserver import MatchResult
+from game.logic.loader import load_logic_class
+from game.simulate import simulate
+
+
+def _chunk_seed(seed: int | None, chunk: int) -> int:
+    # Every chunk gets its own seed derived from the tournament seed, so results do not depend on the worker count.
+    # Without one, seeds are still drawn here, as forked workers would all start from the same random state.
+    if seed is None:
+        return random.getrandbits(64)
+    return random.Random(f"{seed}:{chunk}").getrandbits(64)
+
+
+def _play_chunk(logic_specs: list[str], games: int, seed: int | None) -> MatchResult:
+    # Runs in a worker process. Logic is passed as module:Class specs, as those pickle without trouble.
+    return simulate([load_logic_class(spec) for spec in logic_specs], games, seed)
+
+
+def run_tournament(logic_specs: list[str], games: int, workers: int | None = None, seed: int | None = None,
+                   chunk_size: int = 250) -> MatchResult:
+    # Shards the games in chunks across worker processes and merges the results
+    chunks = [min(chunk_size, games - start) for start in range(0, games, chunk_size)]
+    result = MatchResult()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_play_chunk, logic_specs, amount, _chunk_seed(seed, i))
+                   for i, amount in enumerate(chunks)]
+        for future in futures:
+            result.merge(future.result())
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play games between logic classes on all cores")
+    parser.add_argument("logics", nargs="+", metavar="module:Class", help="Logic class for each seat")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=250)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = run_tournament(args.logics, args.games, args.workers, args.seed, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(result)
+    print(f"Average game length {result.average_game_length():.1f} turns")
+    print("Actions: " + ", ".join(f"{name} {amount}" for name, amount in result.actions.most_common()))
+    print(f"{result.games / elapsed:.0f} games/s with {args.workers} workers")
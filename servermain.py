@@ -1,8 +1,51 @@
-from config import PLAYER_AMOUNT
+import argparse
+import asyncio
+import threading
+
+from config import PLAYER_AMOUNT, GAMES_AMOUNT, CONCURRENT_QUERIES
+from connection.address import DEFAULT_ADDRESS, parse_address
+from connection.channel import ChannelConnection
 from connection.server import get_connections
+from game.gameclient import PlayerClient
 from game.gameserver import Game
+from game.lobby import Lobby
+from game.logic.loader import load_logic_class
+
+
+def in_memory_connections(logic_spec: str, amount: int) -> list[ChannelConnection]:
+    # Runs the bots in threads of this process, each over its own in-memory channel
+    logic_class = load_logic_class(logic_spec)
+    connections = []
+    for _ in range(amount):
+        server_end, client_end = ChannelConnection.pair()
+        threading.Thread(target=PlayerClient(client_end, logic_class()).run, daemon=True).start()
+        connections.append(server_end)
+    return connections
+
 
 if __name__ == "__main__":
-    connections = get_connections(PLAYER_AMOUNT)
-    game = Game(connections)
-    game.run()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--address", default=DEFAULT_ADDRESS,
+                        help="tcp://host:port, unix:///path/to/socket, shm:///path/to/socket for shared memory with "
+                             "bots on this host, or mem:// to play against --bots in this process")
+    parser.add_argument("--bots", metavar="module:Class", help="Logic class of the in-process players for mem://")
+    parser.add_argument("--lobby", action="store_true",
+                        help="Keep seating arriving players into concurrent tables of PLAYER_AMOUNT")
+    args = parser.parse_args()
+
+    scheme, target = parse_address(args.address)
+    if scheme == "mem" and (args.bots is None or args.lobby):
+        parser.error("mem:// needs --bots, and can not be used with --lobby")
+    if scheme == "shm" and args.lobby:
+        parser.error("shm:// can not be used with --lobby")
+
+    if args.lobby:
+        lobby = Lobby(PLAYER_AMOUNT)
+        asyncio.run(lobby.serve(*target) if scheme == "tcp" else lobby.serve_unix(target))
+    else:
+        if scheme == "mem":
+            connections = in_memory_connections(args.bots, PLAYER_AMOUNT)
+        else:
+            connections = get_connections(PLAYER_AMOUNT, args.address)
+        game = Game(connections, concurrent_queries=CONCURRENT_QUERIES)
+        print(game.run_match(GAMES_AMOUNT))
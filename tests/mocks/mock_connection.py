@@ -1,3 +1,5 @@
+import time
+
 from connection.common import Connection
 from game.gameclient import PlayerClient
 from game.logic.clients import ClientLogic
@@ -23,6 +25,17 @@ class ServerMockConnection(Connection):
         pass
 
 
+class SlowConnection(ServerMockConnection):
+    # Takes delay seconds to answer every request
+    def __init__(self, gameclient: PlayerClient, delay: float):
+        super().__init__(gameclient)
+        self.delay = delay
+
+    def send_and_receive(self, command: Command) -> str:
+        time.sleep(self.delay)
+        return super().send_and_receive(command)
+
+
 class DummyConnection(Connection):
     def __init__(self):
         pass
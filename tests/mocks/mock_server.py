@@ -0,0 +1,32 @@
+import os
+import socket
+import tempfile
+import threading
+from unittest import TestCase
+
+from config import FRAMING_HANDSHAKE_TIMEOUT
+from connection.common import Connection
+from connection.server import get_connections
+
+
+def accept_in_background(test: TestCase, amount: int, scheme: str = "unix",
+                         framing_timeout: float = FRAMING_HANDSHAKE_TIMEOUT
+                         ) -> tuple[str, threading.Thread, list[Connection]]:
+    # Runs get_connections in a thread and returns once it listens, with the address, the thread, and the list the
+    # connections are put in when it is done. Unix and shared memory sockets go in a directory removed after the test.
+    if scheme == "tcp":
+        # The port is found free, then listened on again
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            address = f"tcp://127.0.0.1:{probe.getsockname()[1]}"
+    else:
+        directory = tempfile.TemporaryDirectory()
+        test.addCleanup(directory.cleanup)
+        address = f"{scheme}://{os.path.join(directory.name, 'coup.sock')}"
+    accepted = []
+    started = threading.Event()
+    accepting = threading.Thread(target=lambda: accepted.extend(get_connections(amount, address, framing_timeout,
+                                                                                started)), daemon=True)
+    accepting.start()
+    started.wait()
+    return address, accepting, accepted
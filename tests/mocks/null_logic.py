@@ -0,0 +1,79 @@
+from game.enums.actions import Action
+from game.enums.cards import Card
+from game.logic.clients import ClientLogic
+
+
+class NullLogic(ClientLogic):
+    # Answers nothing and keeps no state, so that only the client's own work is measured
+    def debug_message(self, msg: str):
+        pass
+
+    def shutdown(self):
+        pass
+
+    def ask_name(self) -> str:
+        return "null"
+
+    def add_opponent(self, number: int, name: str):
+        pass
+
+    def set_player_number(self, num: int):
+        pass
+
+    def new_game(self):
+        pass
+
+    def add_card(self, c: Card):
+        pass
+
+    def change_money(self, m: int):
+        pass
+
+    def remove_card(self, c: Card):
+        pass
+
+    def player_lost_a_card(self, player: int, card: Card):
+        pass
+
+    def money_changed(self, player: int, amount: int):
+        pass
+
+    def a_player_violated_rules(self, num: int):
+        pass
+
+    def choose_card_to_kill(self):
+        pass
+
+    def choose_ambassador_cards_to_remove(self):
+        pass
+
+    def take_turn(self):
+        pass
+
+    def your_action_is_challenged(self, action: Action, target: int, challenger: int):
+        pass
+
+    def your_block_is_challenged(self, action: Action, taken_by: int, blocker: Card, challenged_by: int):
+        pass
+
+    def do_you_block(self, action: Action, taken_by: int):
+        pass
+
+    def do_you_challenge_action(self, action: Action, taken_by: int, target: int):
+        pass
+
+    def do_you_challenge_block(self, action: Action, taken_by: int, target: int, block_card: Card, blocked_by: int):
+        pass
+
+    def action_was_taken(self, action: Action, taken_by: int, target: int):
+        pass
+
+    def action_was_blocked(self, action: Action, taken_by: int, target: int, block_card: Card, blocker: int):
+        pass
+
+    def action_was_challenged(self, action: Action, taken_by: int, target: int, challenger: int, successful: bool):
+        pass
+
+    def block_was_challenged(self, action: Action, taken_by: int, target: int, block_card: Card, blocker: int,
+                             challenger: int, successful: bool):
+        pass
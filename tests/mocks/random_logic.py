@@ -200,3 +200,15 @@ class RandomLogic(ClientLogic):
 
     def debug_message(self, msg: str):
         print(f"Debug: {msg}")
+
+
+class QuietRandomLogic(RandomLogic):
+    # Random legal play without printing, so benchmarks measure the game and not the terminal
+    def __init__(self):
+        super().__init__(0)
+
+    def add_card(self, c: Card):
+        pass
+
+    def remove_card(self, c: Card):
+        pass
@@ -0,0 +1,79 @@
+import unittest
+from unittest import TestCase
+
+from game.gameclient import PlayerClient
+from game.gameserver import Game
+from game.messages.commands import Command, MoneyChanged
+from game.messages.responses import StealDecision
+from tests.mocks.mock_connection import ServerMockConnection, DummyConnection
+from tests.mocks.mock_logic import MockLogic
+
+
+class CountingConnection(ServerMockConnection):
+    def __init__(self, gameclient: PlayerClient):
+        super().__init__(gameclient)
+        self.writes = 0
+        self.requests = 0
+        self.sent: list[Command] = []
+
+    def send(self, command: Command):
+        self.writes += 1
+        self.sent.append(command)
+        return super().send(command)
+
+    def send_many(self, commands: list[Command]):
+        self.writes += 1
+        self.sent.extend(commands)
+        for c in commands:
+            super().send(c)
+
+    def send_and_receive_response[R](self, command: Command, response_type: type[R]) -> R | None:
+        self.requests += 1
+        self.writes += 1
+        response = self.client.run_command(command)
+        return None if response is None else response_type.deserialize(response.serialize())
+
+
+def steal_from_next(self: MockLogic):
+    return StealDecision((self.get_state().number + 1) % 3)
+
+
+class BroadcastTest(TestCase):
+    def test_one_write_per_batch(self):
+        connections = [CountingConnection(PlayerClient(DummyConnection(), MockLogic(steal_from_next, False, False,
+                                                                                    False))) for _ in range(3)]
+        game = Game(connections)
+        game.setup_players()
+        for c in connections:
+            c.writes = c.requests = 0
+            c.sent = []
+
+        game.run_one_turn()
+        for c in connections:
+            # Every request is preceded by at most one batch, and the rest is flushed once at the end of the turn
+            self.assertLessEqual(c.writes, 2 * c.requests + 1)
+            self.assertGreater(len(c.sent), 1)
+
+        # Broadcasts are the same object for everyone, so they are serialized once
+        money_changes = [[m for m in c.sent if isinstance(m, MoneyChanged)] for c in connections]
+        # Paying the cost of 0, and the stolen money for both players
+        self.assertEqual(len(money_changes[0]), 3)
+        for changes in money_changes[1:]:
+            self.assertEqual([id(m) for m in changes], [id(m) for m in money_changes[0]])
+
+    def test_client_state_is_up_to_date_before_requests(self):
+        connections = [CountingConnection(PlayerClient(DummyConnection(), MockLogic(steal_from_next, False, False,
+                                                                                    False))) for _ in range(3)]
+        game = Game(connections)
+        game.setup_players()
+        for _ in range(3):
+            game.run_one_turn()
+        for p, c in zip(game.all_players.values(), connections):
+            self.assertEqual(c.client.money, p.money)
+            self.assertEqual(c.client.cards, p.cards)
+            for opp in c.client.opponents.values():
+                self.assertEqual(opp.money, game.all_players[opp.number].money)
+
+
+if __name__ == '__main__':
+    unittest.main()
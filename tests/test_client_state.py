@@ -0,0 +1,45 @@
+import unittest
+from unittest import TestCase
+
+from game.enums.cards import Captain, Duke
+from game.gameclient import PlayerClient
+from game.messages.commands import AddOpponent, SetPlayerNumber, AddCard, MoneyChanged, PlayerLostACard, ChangeMoney
+from game.simulate import NullConnection
+from tests.mocks.random_logic import RandomLogic
+
+
+class ClientStateTest(TestCase):
+    def setUp(self):
+        self.client = PlayerClient(NullConnection(), RandomLogic(0))
+        for command in [SetPlayerNumber(0), AddOpponent(1, "one"), AddOpponent(2, "two"), AddCard(Duke())]:
+            self.client.run_command(command)
+
+    def test_state_is_reused_until_it_changes(self):
+        state = self.client.get_client_state()
+        self.assertIs(self.client.get_client_state(), state)
+
+        self.client.run_command(ChangeMoney(2))
+        changed = self.client.get_client_state()
+        self.assertIsNot(changed, state)
+        self.assertEqual(changed.money, 2)
+
+    def test_state_is_a_snapshot(self):
+        state = self.client.get_client_state()
+        for command in [AddCard(Captain()), MoneyChanged(1, 3), PlayerLostACard(1, Duke())]:
+            self.client.run_command(command)
+
+        self.assertEqual(state.cards, (Duke(),))
+        self.assertEqual(state.opponents[1].money, 2)
+        self.assertEqual(state.opponents[1].dead_cards, ())
+
+        new_state = self.client.get_client_state()
+        self.assertEqual(new_state.cards, (Duke(), Captain()))
+        self.assertEqual(new_state.opponents[1].money, 5)
+        self.assertEqual(new_state.opponents[1].cards_amount, 1)
+        self.assertEqual(new_state.opponents[1].dead_cards, (Duke(),))
+        # Only the opponent that changed is copied again
+        self.assertIs(new_state.opponents[2], state.opponents[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
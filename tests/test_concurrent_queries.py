@@ -0,0 +1,100 @@
+import threading
+import time
+import unittest
+from unittest import TestCase
+
+from connection.channel import ChannelConnection
+from game.enums.actions import Action
+from game.enums.cards import Duke
+from game.gameclient import PlayerClient
+from game.gameserver import Game
+from game.instrumentation import Instrumentation, InMemorySink
+from game.messages.responses import ForeignAidDecision, TaxDecision, DoYouBlockDecision
+from tests.mocks.mock_connection import SlowConnection, DummyConnection, get_server_mock_connection
+from tests.mocks.mock_logic import MockLogic
+
+
+class LateBlockLogic(MockLogic):
+    # Answers whether it blocks only after the query timeout
+    def do_you_block(self, action: Action, taken_by: int) -> DoYouBlockDecision:
+        time.sleep(0.5)
+        return super().do_you_block(action, taken_by)
+
+
+class Methods:
+    @staticmethod
+    def tax_if_duke_or_fa(self: MockLogic):
+        if Duke() in self.get_state().cards:
+            return TaxDecision()
+        else:
+            return ForeignAidDecision()
+
+    @staticmethod
+    def always_fa(self: MockLogic):
+        return ForeignAidDecision()
+
+
+class ConcurrentQueriesTest(TestCase):
+    def test_same_result_as_sequential(self):
+        for challenge, block, challenge_block in [(False, False, False), (True, False, False), (False, True, False),
+                                                  (False, True, True), (True, True, True)]:
+            states = []
+            for concurrent in [False, True]:
+                clients = [get_server_mock_connection(MockLogic(Methods.tax_if_duke_or_fa, challenge, block,
+                                                                challenge_block)) for _ in range(4)]
+                game = Game(clients, rng=11, concurrent_queries=concurrent)
+                game.setup_players()
+                for _ in range(6):
+                    if game.run_one_turn():
+                        break
+                states.append([(p.number, p.money, p.cards) for p in game.alive_players.values()])
+                game.shutdown_players()
+            self.assertEqual(states[0], states[1])
+
+    def test_one_round_trip(self):
+        def turn_time(concurrent: bool) -> float:
+            clients = [SlowConnection(PlayerClient(DummyConnection(), MockLogic(Methods.always_fa, False, False, False)),
+                                      0.05) for _ in range(5)]
+            game = Game(clients, concurrent_queries=concurrent)
+            game.setup_players()
+            start = time.perf_counter()
+            game.run_one_turn()
+            elapsed = time.perf_counter() - start
+            game.shutdown_players()
+            return elapsed
+
+        # Taking the turn, then four players asked whether they block
+        self.assertGreater(turn_time(False), 0.25)
+        self.assertLess(turn_time(True), 0.15)
+
+    def test_late_player_is_cut_off(self):
+        connections, bots = [], []
+        for number in range(3):
+            server_end, client_end = ChannelConnection.pair()
+            logic = (LateBlockLogic if number == 2 else MockLogic)(Methods.always_fa, False, False, False)
+            bots.append(threading.Thread(target=PlayerClient(client_end, logic).run, daemon=True))
+            bots[-1].start()
+            connections.append(server_end)
+        sink = InMemorySink()
+        instrumentation = Instrumentation(sink)
+        game = Game(connections, concurrent_queries=True, query_timeout=0.1, instrumentation=instrumentation)
+        game.setup_players()
+        game.run_one_turn()
+        # The late player timed out, and the foreign aid went through
+        self.assertEqual(list(game.rule_abiding_players), [0, 1])
+        self.assertEqual(game.all_players[0].money, 4)
+        # Its answer arrives after the turn, and is not measured or read by anyone
+        counters = sink.counters.copy()
+        stats = instrumentation.stats.players[2].bytes_received
+        time.sleep(0.6)
+        self.assertEqual(sink.counters, counters)
+        self.assertEqual(instrumentation.stats.players[2].bytes_received, stats)
+        self.assertEqual(game.all_players[2].cards, [])
+        game.shutdown_players()
+        for bot in bots:
+            bot.join(2)
+            self.assertFalse(bot.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
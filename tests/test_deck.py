@@ -1,8 +1,12 @@
 import unittest
 from unittest import TestCase
 
+import random
+from collections import Counter
+
 from config import EACH_CARD_IN_DECK
-from game.enums.cards import Card, Ambassador, Assassin, Contessa
+from game.deck import Deck
+from game.enums.cards import Card, Ambassador, Assassin, Contessa, Duke
 from game.gameserver import Game
 from game.messages.responses import AmbassadateDecision
 from tests.mocks.mock_connection import get_server_mock_connection
@@ -76,6 +80,29 @@ class DeckTest(TestCase, Methods):
         self.assertEqual(all_cards_in_play.count(Ambassador()), 2)
         self.assertEqual(all_cards_in_play.count(Assassin()), 1)
 
+    def test_seeded_game_is_reproducible(self):
+        def play(seed: int):
+            clients = [get_server_mock_connection(MockLogic(Methods.always_ambassador, True, False, False)) for _ in
+                       range(3)]
+            game = Game(clients, rng=seed)
+            game.setup_players()
+            for _ in range(4):
+                game.run_one_turn()
+            return game.deck, [p.cards for p in game.all_players.values()]
+
+        self.assertEqual(play(3), play(3))
+        self.assertNotEqual(play(3), play(4))
+
+    def test_draw_is_uniform(self):
+        draws = Counter()
+        rng = random.Random(1)
+        for _ in range(6000):
+            deck = Deck([Ambassador(), Assassin(), Contessa(), Duke(), Duke(), Duke()], rng)
+            draws[deck.draw()] += 1
+            self.assertEqual(len(deck), 5)
+        for card, expected in [(Ambassador(), 1000), (Assassin(), 1000), (Contessa(), 1000), (Duke(), 3000)]:
+            self.assertAlmostEqual(draws[card] / expected, 1, delta=0.1)
+
 
 if __name__ == '__main__':
     unittest.main()
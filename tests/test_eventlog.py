@@ -0,0 +1,58 @@
+import io
+import unittest
+from unittest import TestCase
+
+from config import START_MONEY, START_CARDS_AMOUNT
+from game.enums.actions import Steal
+from game.enums.cards import Captain
+from game.eventlog import EventLog, EventKind, read_events, read_games, RECORD, Event
+from game.gameserver import Game
+from tests.mocks.mock_connection import get_server_mock_connection
+from tests.mocks.random_logic import RandomLogic
+
+
+class EventLogTest(TestCase):
+    def test_log_of_a_match(self):
+        log = io.BytesIO()
+        clients = [get_server_mock_connection(RandomLogic(0)) for _ in range(3)]
+        game = Game(clients, crash_on_violation=True, rng=2, event_log=EventLog(log))
+        game.play_game()
+
+        log.seek(0)
+        events = list(read_events(log, chunk_records=7))
+        self.assertEqual(len(log.getvalue()), len(events) * RECORD.size)
+        self.assertEqual(events[0].kind, EventKind.GAME_START)
+        self.assertEqual(events[0].amount, 3)
+        self.assertEqual(events[-1].kind, EventKind.GAME_END)
+        winner = game.all_players[events[-1].actor]
+        self.assertIn(winner.number, game.alive_players)
+
+        money = sum(e.amount for e in events if e.kind == EventKind.MONEY_CHANGE and e.actor == winner.number)
+        self.assertEqual(START_MONEY + money, winner.money)
+        for p in game.all_players.values():
+            lost = [e.card for e in events if e.kind == EventKind.CARD_LOSS and e.actor == p.number]
+            self.assertEqual(len(lost), START_CARDS_AMOUNT - len(p.cards))
+        self.assertTrue(any(e.kind == EventKind.ACTION and e.action is not None for e in events))
+
+    def test_games_are_grouped(self):
+        log = io.BytesIO()
+        clients = [get_server_mock_connection(RandomLogic(0)) for _ in range(2)]
+        Game(clients, crash_on_violation=True, event_log=EventLog(log)).run_match(4)
+
+        log.seek(0)
+        games = list(read_games(log))
+        self.assertEqual(len(games), 4)
+        for events in games:
+            self.assertEqual(events[0].kind, EventKind.GAME_START)
+            self.assertEqual(events[-1].kind, EventKind.GAME_END)
+
+    def test_cards_and_actions_are_stored_by_their_fixed_ids(self):
+        # Logs written before stay readable whatever order the classes are defined in
+        log = io.BytesIO()
+        EventLog(log).block(0, Steal(), 1, Captain(), 1)
+        self.assertEqual(log.getvalue(), RECORD.pack(EventKind.BLOCK, 0, 1, 0, 3, 1, -1, False, 0))
+        self.assertEqual(Event.unpack_from(log.getvalue()), Event(EventKind.BLOCK, 0, 1, Steal(), Captain(), 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import socket
+import threading
+import unittest
+from unittest import TestCase
+
+from connection.common import OpenSocket, LENGTH_PREFIX
+from game.enums.cards import Duke
+from game.messages.codec import Codec, TEXT, BINARY
+from game.messages.commands import Command, DebugMessage, MoneyChanged
+from game.messages.responses import Block
+
+
+class FramingTest(TestCase):
+    def setUp(self):
+        self.server_sock, self.client_sock = socket.socketpair()
+        self.addCleanup(self.server_sock.close)
+        self.addCleanup(self.client_sock.close)
+
+    def _negotiate(self, codec: Codec = TEXT) -> tuple[OpenSocket, OpenSocket]:
+        server, client = OpenSocket(self.server_sock), OpenSocket(self.client_sock)
+        accepting = threading.Thread(target=server.accept_length_prefix, args=(5,))
+        accepting.start()
+        client.request_length_prefix(codec)
+        accepting.join()
+        return server, client
+
+    def test_negotiation(self):
+        server, client = self._negotiate()
+        self.assertTrue(server.length_prefixed)
+        self.assertTrue(client.length_prefixed)
+
+        server.send(MoneyChanged(1, 2))
+        self.assertEqual(client.receive(), MoneyChanged(1, 2).serialize())
+
+    def test_binary_negotiation(self):
+        server, client = self._negotiate(BINARY)
+        self.assertIs(server.codec, BINARY)
+        self.assertIs(client.codec, BINARY)
+
+        server.send_many([DebugMessage("hi ^~"), MoneyChanged(1, -2)])
+        self.assertEqual(client.codec.decode(client.receive_frame(), Command).message, "hi ^~")
+        self.assertEqual(client.codec.decode(client.receive_frame(), Command).amount, -2)
+        client.send(Block(Duke()))
+        self.assertIs(server.codec.decode(server.receive_frame(), Block).card, Duke())
+
+    def test_legacy_client(self):
+        server = OpenSocket(self.server_sock)
+        server.accept_length_prefix(0.05)
+        self.assertFalse(server.length_prefixed)
+
+        server.send(MoneyChanged(1, 2))
+        self.assertEqual(self.client_sock.recv(1024).decode("UTF-8"), MoneyChanged(1, 2).serialize())
+
+    def test_legacy_messages_in_one_segment_and_split(self):
+        receiver = OpenSocket(self.client_sock)
+        self.server_sock.sendall((MoneyChanged(0, 1).serialize() + MoneyChanged(1, 2).serialize()).encode("UTF-8"))
+        self.server_sock.sendall(b"money_changed^0")
+        self.assertEqual(receiver.receive(), MoneyChanged(0, 1).serialize())
+        self.assertEqual(receiver.receive(), MoneyChanged(1, 2).serialize())
+        self.server_sock.sendall(b"^3~")
+        self.assertEqual(receiver.receive(), MoneyChanged(0, 3).serialize())
+        self.server_sock.close()
+        self.assertEqual(receiver.receive(), "")
+
+    def test_long_message_split_into_segments(self):
+        receiver = OpenSocket(self.client_sock, length_prefixed=True)
+        payload = DebugMessage("x" * 5000).serialize().encode("UTF-8")
+        data = LENGTH_PREFIX.pack(len(payload)) + payload
+        for i in range(0, len(data), 700):
+            self.server_sock.sendall(data[i:i + 700])
+        self.assertEqual(Command.deserialize(receiver.receive()).message, "x" * 5000)
+
+    def test_receive_buffer_wraps_and_grows(self):
+        for length_prefixed in [True, False]:
+            sender = OpenSocket(self.server_sock, length_prefixed)
+            receiver = OpenSocket(self.client_sock, length_prefixed)
+            # Enough small messages to wrap the receive buffer several times, then one bigger than the buffer
+            messages = [MoneyChanged(i % 6, i) for i in range(30000)] + [DebugMessage("x" * 200000), MoneyChanged(0, 1)]
+            sending = threading.Thread(target=sender.send_many, args=(messages,))
+            sending.start()
+            for message in messages:
+                self.assertEqual(receiver.receive(), message.serialize())
+            sending.join()
+
+    def test_many_messages_in_order(self):
+        # Throughput is measured in benchmarks/bench_framing.py
+        server, client = self._negotiate()
+        amount = 20000
+
+        def send_all():
+            for i in range(amount):
+                server.send(MoneyChanged(i % 6, i))
+
+        sending = threading.Thread(target=send_all)
+        sending.start()
+        for i in range(amount):
+            command = Command.deserialize(client.receive())
+            self.assertEqual(command.amount, i)
+        sending.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import socket
+import struct
+import threading
+import time
+import unittest
+from unittest import TestCase
+
+from connection.address import connect, parse_address
+from connection.channel import ChannelConnection
+from game.gameclient import PlayerClient
+from game.gameserver import Game
+from tests.mocks.mock_server import accept_in_background
+from tests.mocks.random_logic import RandomLogic
+
+
+class SlowLogic(RandomLogic):
+    def __init__(self, delay: float):
+        super().__init__(0)
+        self.delay = delay
+
+    def ask_name(self) -> str:
+        time.sleep(self.delay)
+        return f"slow {self.delay}"
+
+
+class HandshakeTest(TestCase):
+    def _game(self, delays: list[float], handshake_timeout: float) -> tuple[Game, float]:
+        connections = []
+        self.bots = []
+        for delay in delays:
+            server_end, client_end = ChannelConnection.pair()
+            self.bots.append(threading.Thread(target=PlayerClient(client_end, SlowLogic(delay)).run, daemon=True))
+            self.bots[-1].start()
+            connections.append(server_end)
+        start = time.perf_counter()
+        game = Game(connections, handshake_timeout=handshake_timeout)
+        return game, time.perf_counter() - start
+
+    def test_names_are_asked_at_once(self):
+        game, elapsed = self._game([0.2, 0.2, 0.2], 5)
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual([p.name for p in game.rule_abiding_players.values()], ["slow 0.2"] * 3)
+
+    def test_players_missing_the_deadline_are_left_out(self):
+        game, elapsed = self._game([0, 1, 0], 0.2)
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(list(game.rule_abiding_players), [0, 2])
+        self.assertEqual(game.run_match(2).games, 2)
+        # The late player's connection was closed, so it leaves once it has answered
+        self.bots[1].join(2)
+        self.assertFalse(self.bots[1].is_alive())
+
+    def test_silent_clients_negotiate_at_once(self):
+        # Legacy clients never send a hello, so each of them costs the whole framing timeout
+        address, accepting, accepted = accept_in_background(self, 4, framing_timeout=0.3)
+        start = time.perf_counter()
+        silent = [socket.socket(socket.AF_UNIX) for _ in range(3)]
+        for s in silent:
+            s.connect(parse_address(address)[1])
+        clients = [connect(address)]
+        accepting.join(5)
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 0.6)
+        # The client with a hello is seated before the silent ones
+        self.assertEqual([c.length_prefixed for c in accepted], [True, False, False, False])
+        for c in accepted + clients:
+            c.close()
+        for s in silent:
+            s.close()
+
+    def test_shared_memory_clients_are_set_up_at_once(self):
+        address, accepting, accepted = accept_in_background(self, 2, "shm", 5)
+        start = time.perf_counter()
+        # A client that never sends its hello, and one with an unknown codec, are set up around
+        silent, bad = socket.socket(socket.AF_UNIX), socket.socket(socket.AF_UNIX)
+        silent.connect(parse_address(address)[1])
+        bad.connect(parse_address(address)[1])
+        bad.sendall(b"\x00BAD")
+        clients = [connect(address) for _ in range(2)]
+        accepting.join(5)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(len(accepted), 2)
+        for c in accepted + clients + [silent, bad]:
+            c.close()
+
+    def test_reset_clients_are_dropped(self):
+        # Resetting needs TCP
+        address, accepting, accepted = accept_in_background(self, 1, "tcp", 5)
+        reset = socket.create_connection(parse_address(address)[1])
+        reset.sendall(b"\x00")
+        reset.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        reset.close()
+        # The reset reaches the server before the good client, or the table is full without it
+        time.sleep(0.05)
+        client = connect(address)
+        accepting.join(5)
+        self.assertFalse(accepting.is_alive())
+        self.assertEqual(len(accepted), 1)
+        self.assertTrue(accepted[0].length_prefixed)
+        for c in accepted + [client]:
+            c.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import io
+import json
+import socket
+import threading
+import unittest
+from unittest import TestCase
+
+from connection.common import OpenSocket
+from game.gameclient import PlayerClient
+from game.gameserver import Game
+from game.instrumentation import Instrumentation, JsonlSink, InMemorySink, LatencyHistogram
+from tests.mocks.mock_connection import get_server_mock_connection
+from tests.mocks.random_logic import RandomLogic
+
+
+class InstrumentationTest(TestCase):
+    def test_socket_game(self):
+        pairs = [socket.socketpair() for _ in range(2)]
+        clients = [threading.Thread(target=PlayerClient(OpenSocket(client), RandomLogic(0)).run) for _, client in pairs]
+        for c in clients:
+            c.start()
+
+        log = io.StringIO()
+        game = Game([OpenSocket(server) for server, _ in pairs], instrumentation=Instrumentation(JsonlSink(log)))
+        stats = game.run()
+        for c in clients:
+            c.join(10)
+
+        self.assertEqual(sum(p.turns for p in stats.players.values()), game.turns_played)
+        for player in stats.players.values():
+            self.assertEqual(player.latency["AskName"].count, 1)
+            self.assertGreater(player.bytes_sent, 0)
+            self.assertGreater(player.bytes_received, 0)
+        records = [json.loads(line) for line in log.getvalue().splitlines()]
+        requests = [r for r in records if r["kind"] == "request"]
+        self.assertEqual(len(requests), sum(h.count for p in stats.players.values() for h in p.latency.values()))
+        self.assertEqual(sum(r["bytes_received"] for r in requests),
+                         sum(p.bytes_received for p in stats.players.values()))
+
+    def test_retries(self):
+        sink = InMemorySink()
+        instrumentation = Instrumentation(sink)
+        for _ in range(20):
+            clients = [get_server_mock_connection(RandomLogic(0.3, only_one_wrong=True)) for _ in range(2)]
+            Game(clients, crash_on_violation=True, instrumentation=instrumentation).play_game()
+
+        retries = sum(sum(p.retries.values()) for p in instrumentation.stats.players.values())
+        self.assertGreater(retries, 0)
+        self.assertEqual(sum(n for (kind, _), n in sink.counters.items() if kind == "retry"), retries)
+
+    def test_histogram(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.add(ms / 1000)
+        self.assertEqual(histogram.count, 100)
+        self.assertAlmostEqual(histogram.mean(), 0.0505)
+        self.assertEqual(histogram.percentile(50), 0.05)
+        self.assertEqual(histogram.percentile(99), 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import unittest
+from unittest import TestCase
+
+from connection.asynchronous import AsyncOpenSocket
+from connection.common import OpenSocket
+from game.gameclient import PlayerClient, AsyncPlayerClient
+from game.lobby import Lobby
+from game.messages.codec import Codec, TEXT, BINARY
+from tests.mocks.random_logic import RandomLogic
+
+
+def run_client(port: int, length_prefixed: bool, codec: Codec = TEXT):
+    PlayerClient(OpenSocket.new("localhost", port, length_prefixed, codec), RandomLogic(0)).run()
+
+
+class LobbyTest(TestCase):
+    def test_concurrent_tables(self):
+        tables, table_size = 4, 3
+
+        async def main():
+            lobby = Lobby(table_size)
+            serving = asyncio.create_task(lobby.serve("localhost", 0, tables))
+            await lobby.started.wait()
+            # Mix legacy, length-prefixed and binary clients
+            clients = [threading.Thread(target=run_client,
+                                        args=(lobby.port, i % 3 != 0, BINARY if i % 3 == 2 else TEXT))
+                       for i in range(tables * table_size)]
+            for c in clients:
+                c.start()
+            await asyncio.wait_for(serving, 60)
+            for c in clients:
+                await asyncio.to_thread(c.join, 10)
+                self.assertFalse(c.is_alive())
+            return lobby
+
+        lobby = asyncio.run(main())
+        self.assertEqual(lobby.tables_started, tables)
+        self.assertEqual(lobby.tables_finished, tables)
+        self.assertEqual(lobby.tables_crashed, 0)
+
+    def test_async_clients_share_the_loop(self):
+        tables, table_size = 3, 3
+
+        async def run_async_client(port: int, length_prefixed: bool, codec: Codec):
+            connection = await AsyncOpenSocket.new("localhost", port, length_prefixed, codec)
+            await AsyncPlayerClient(connection, RandomLogic(0)).run()
+
+        async def main():
+            lobby = Lobby(table_size)
+            serving = asyncio.create_task(lobby.serve("localhost", 0, tables))
+            await lobby.started.wait()
+            clients = [asyncio.create_task(run_async_client(lobby.port, i % 3 != 0, BINARY if i % 3 == 2 else TEXT))
+                       for i in range(tables * table_size)]
+            await asyncio.wait_for(serving, 60)
+            await asyncio.wait_for(asyncio.gather(*clients), 10)
+            return lobby
+
+        lobby = asyncio.run(main())
+        self.assertEqual(lobby.tables_finished, tables)
+        self.assertEqual(lobby.tables_crashed, 0)
+
+    def test_bad_and_leaving_clients_are_not_seated(self):
+        async def main():
+            lobby = Lobby(2)
+            serving = asyncio.create_task(lobby.serve("localhost", 0, 1))
+            await lobby.started.wait()
+            # An unknown hello, and a client that leaves while it waits for a table
+            _, bad = await asyncio.open_connection("localhost", lobby.port)
+            bad.write(b"\x00XYZ")
+            leaving = await AsyncOpenSocket.new("localhost", lobby.port)
+            await asyncio.sleep(0.1)
+            await leaving.close()
+            await asyncio.sleep(0.1)
+            clients = [threading.Thread(target=run_client, args=(lobby.port, True)) for _ in range(2)]
+            for c in clients:
+                c.start()
+            await asyncio.wait_for(serving, 60)
+            for c in clients:
+                await asyncio.to_thread(c.join, 10)
+                self.assertFalse(c.is_alive())
+            bad.close()
+            return lobby
+
+        lobby = asyncio.run(main())
+        self.assertEqual(lobby.tables_finished, 1)
+        self.assertEqual(lobby.tables_crashed, 0)
+
+    def test_clients_left_waiting_are_closed(self):
+        async def main():
+            lobby = Lobby(2)
+            serving = asyncio.create_task(lobby.serve("localhost", 0, 1))
+            await lobby.started.wait()
+            # The third client never gets a table
+            clients = [threading.Thread(target=run_client, args=(lobby.port, True)) for _ in range(3)]
+            for c in clients:
+                c.start()
+            await asyncio.wait_for(serving, 15)
+            for c in clients:
+                await asyncio.to_thread(c.join, 10)
+                self.assertFalse(c.is_alive())
+            return lobby
+
+        lobby = asyncio.run(main())
+        self.assertEqual(lobby.tables_finished, 1)
+        self.assertEqual(lobby._waiting, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
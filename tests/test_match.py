@@ -0,0 +1,41 @@
+import unittest
+from unittest import TestCase
+
+from game.gameserver import Game
+from tests.mocks.mock_connection import get_server_mock_connection
+from tests.mocks.random_logic import RandomLogic
+
+
+class MatchTest(TestCase):
+    def test_match_statistics(self):
+        clients = [get_server_mock_connection(RandomLogic(0)) for _ in range(3)]
+        game = Game(clients, crash_on_violation=True)
+        result = game.run_match(30)
+
+        self.assertEqual(result.games, 30)
+        self.assertEqual(sum(result.wins.values()), 30)
+        self.assertAlmostEqual(sum(result.win_rate(n) for n in range(3)), 1)
+
+    def test_new_game_resets_state_and_rotates_seats(self):
+        clients = [get_server_mock_connection(RandomLogic(0)) for _ in range(3)]
+        game = Game(clients, crash_on_violation=True)
+        game.play_game()
+
+        game.new_game(starting_seat=1)
+        self.assertEqual(list(game.alive_players), [1, 2, 0])
+        self.assertEqual(len(game.deck), 15)
+        for p in game.rule_abiding_players.values():
+            self.assertEqual(p.cards, [])
+            self.assertEqual(p.money, 0)
+
+        game.setup_players()
+        for p, c in zip(game.rule_abiding_players.values(), clients):
+            self.assertEqual(c.client.cards, p.cards)
+            self.assertEqual(c.client.money, p.money)
+            for opp in c.client.opponents.values():
+                self.assertEqual(opp.cards_amount, 2)
+                self.assertEqual(opp.dead_cards, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
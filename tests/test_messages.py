@@ -0,0 +1,94 @@
+import unittest
+from unittest import TestCase
+
+from game.enums.actions import Action, Steal, Assassinate, ACTION_IDS
+from game.enums.cards import Card, Captain, Duke, Contessa, CARD_IDS
+from game.gameclient import PlayerClient
+from game.messages.codec import BINARY_LAYOUTS, BINARY, TEXT
+from game.messages.commands import *
+from game.messages.responses import *
+
+EXAMPLES = [
+    DebugMessage("debug"), Shutdown(), AskName(), AddOpponent(3, "name"), SetPlayerNumber(2), NewGame(),
+    AddCard(Duke()), ChangeMoney(-7), RemoveCard(Captain()), PlayerLostACard(1, Contessa()), MoneyChanged(0, 3),
+    TimeBankLeft(120000), PlayerViolatedRules(4), ChooseCardToKill(), ChooseAmbassadorCardsToRemove(), TakeTurn(),
+    YourActionIsChallenged(Steal(), 1, 2), YourBlockIsChallenged(Steal(), 0, Captain(), 2), DoYouBlock(Steal(), 0),
+    DoYouChallengeAction(Assassinate(), 0, 1), DoYouChallengeBlock(Steal(), 0, 1, Captain(), 1),
+    ActionWasTaken(Steal(), 0, -1), ActionWasBlocked(Steal(), 0, 1, Captain(), 1),
+    ActionWasChallenged(Steal(), 0, 1, 2, True), BlockWasChallenged(Assassinate(), 0, 1, Contessa(), 1, 2, False),
+    NameResponse("name"), IncomeDecision(), ForeignAidDecision(), TaxDecision(), AmbassadateDecision(),
+    AssassinateDecision(1), StealDecision(2), CoupDecision(3), RevealCard(), Concede(), Challenge(), Allow(),
+    Block(Contessa()), NoBlock(), CardResponse(Duke()), AmbassadorCardResponse(Duke(), Captain()),
+]
+
+
+class MessagesTest(TestCase):
+    def test_round_trip(self):
+        command = Command.deserialize(DoYouChallengeBlock(Steal(), 0, 1, Captain(), 1).serialize())
+        self.assertIsInstance(command, DoYouChallengeBlock)
+        self.assertEqual(command.block_card, Captain())
+        self.assertEqual(command.blocked_by, 1)
+
+        response = Response.deserialize(StealDecision(2).serialize())
+        self.assertIsInstance(response, StealDecision)
+        self.assertEqual(response.target(), 2)
+
+    def test_only_asked_type_is_parsed(self):
+        self.assertIsNone(Response.deserialize(TakeTurn().serialize()))
+        self.assertIsNone(Command.deserialize(StealDecision(1).serialize()))
+        self.assertIsNone(ActionDecision.deserialize(CardResponse(Captain()).serialize()))
+        self.assertIsInstance(ActionDecision.deserialize(StealDecision(1).serialize()), StealDecision)
+
+    def test_unknown_or_broken_messages(self):
+        self.assertIsNone(Command.deserialize("no_such_message^1~"))
+        self.assertIsNone(Response.deserialize("steal_decision^no~"))
+        self.assertIsNone(Response.deserialize("steal_decision~"))
+
+    def test_cards_and_actions_are_interned(self):
+        self.assertIs(Card.with_name("captain"), Captain())
+        self.assertIs(Action.with_name("steal"), Steal())
+        self.assertIs(Command.deserialize(DoYouChallengeBlock(Steal(), 0, 1, Captain(), 1).serialize()).action, Steal())
+        self.assertNotEqual(Captain(), Duke())
+        self.assertEqual(len({Captain(), Captain(), Duke()}), 2)
+        self.assertEqual(str(Captain()), "captain")
+        self.assertRaises(ValueError, Card.with_name, "no")
+        self.assertRaises(ValueError, Action.with_name, "no")
+
+    def test_messages_have_no_instance_dict(self):
+        for message_type in Command.transitive_named_subclasses() + Response.transitive_named_subclasses():
+            self.assertEqual(message_type.__dictoffset__, 0, message_type.__name__)
+
+    def test_every_message_round_trips_in_both_codecs(self):
+        self.assertEqual({type(m) for m in EXAMPLES}, set(BINARY_LAYOUTS))
+        self.assertEqual(set(Command.transitive_named_subclasses() + Response.transitive_named_subclasses()),
+                         set(BINARY_LAYOUTS))
+        for codec in [TEXT, BINARY]:
+            for message in EXAMPLES:
+                decoded = codec.decode(codec.encode(message), type(message))
+                self.assertIs(type(decoded), type(message))
+                self.assertEqual(decoded.serialize(), message.serialize())
+
+    def test_every_card_and_action_has_an_id(self):
+        self.assertEqual(set(CARD_IDS), set(Card.all()))
+        self.assertEqual(set(ACTION_IDS), set(Action.all()))
+        # Ids fit in a byte and none is used twice
+        for ids in [CARD_IDS, ACTION_IDS]:
+            self.assertEqual(len(set(ids.values())), len(ids))
+            self.assertTrue(all(0 <= i < 256 for i in ids.values()))
+
+    def test_binary_codec_rejects_other_types_and_broken_data(self):
+        self.assertIsNone(BINARY.decode(BINARY.encode(TakeTurn()), Response))
+        self.assertIsNone(BINARY.decode(BINARY.encode(StealDecision(1)), Command))
+        self.assertIsNone(BINARY.decode(BINARY.encode(MoneyChanged(1, 2))[:-1], Command))
+        self.assertIsNone(BINARY.decode(b"\xff", Command))
+        self.assertIsNone(BINARY.decode(bytes([BINARY_LAYOUTS[AddCard][0], 200]), Command))
+        self.assertIsNone(BINARY.decode(b"", Command))
+        self.assertLess(len(BINARY.encode(BlockWasChallenged(Assassinate(), 0, 1, Contessa(), 1, 2, True))),
+                        len(TEXT.encode(BlockWasChallenged(Assassinate(), 0, 1, Contessa(), 1, 2, True))))
+
+    def test_client_handles_every_command(self):
+        self.assertEqual(set(Command.transitive_named_subclasses()), set(PlayerClient.HANDLERS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from unittest import TestCase
+
+from game.logic.clients import ExtremelySimpleTestClient
+from game.logic.loader import load_logic_class
+from game.messages.commands import TakeTurn, AddOpponent
+from game.messages.responses import ActionDecision, CardResponse
+from game.simulate import simulate, DirectConnection
+from tests.mocks.random_logic import RandomLogic
+
+
+class SimulateTest(TestCase):
+    def test_simulate(self):
+        result = simulate([lambda: RandomLogic(0)] * 3, 100, seed=1)
+        self.assertEqual(result.games, 100)
+        self.assertEqual(sum(result.wins.values()), 100)
+
+    def test_direct_connection_checks_response_type(self):
+        connection = DirectConnection(RandomLogic(0))
+        connection.send(AddOpponent(1, "opponent"))
+        self.assertIsInstance(connection.send_and_receive_response(TakeTurn(), ActionDecision), ActionDecision)
+        self.assertIsNone(connection.send_and_receive_response(TakeTurn(), CardResponse))
+
+    def test_load_logic_class(self):
+        self.assertIs(load_logic_class("game.logic.clients:ExtremelySimpleTestClient"), ExtremelySimpleTestClient)
+        self.assertRaises(ValueError, load_logic_class, "game.logic.clients")
+        self.assertRaises(TypeError, load_logic_class, "game.messages.commands:ChooseCardToKill")
+
+
+if __name__ == '__main__':
+    unittest.main()
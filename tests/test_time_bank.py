@@ -0,0 +1,60 @@
+import unittest
+from unittest import TestCase
+
+from game.gameclient import PlayerClient
+from game.gameserver import Game
+from game.messages.responses import IncomeDecision
+from tests.mocks.mock_connection import SlowConnection, DummyConnection
+from tests.mocks.mock_logic import MockLogic
+
+
+def always_income(self: MockLogic):
+    return IncomeDecision()
+
+
+class TimeBankTest(TestCase):
+    def test_time_bank_is_visible_to_the_client(self):
+        seen = []
+
+        def income_and_remember(logic: MockLogic):
+            seen.append(logic.get_state().time_bank)
+            return IncomeDecision()
+
+        clients = [SlowConnection(PlayerClient(DummyConnection(), MockLogic(income_and_remember, False, False, False)),
+                                  0.01) for _ in range(2)]
+        game = Game(clients, time_bank=5)
+        game.setup_players()
+        for _ in range(4):
+            game.run_one_turn()
+
+        self.assertEqual(len(seen), 4)
+        self.assertLessEqual(seen[2], seen[0])
+        self.assertLess(seen[2], 5)
+        self.assertGreater(seen[2], 4)
+
+    def test_running_out_of_time_kills(self):
+        clients = [SlowConnection(PlayerClient(DummyConnection(), MockLogic(always_income, False, False, False)), d)
+                   for d in [0, 0.05]]
+        game = Game(clients, time_bank=0.12)
+        game.setup_players()
+        for _ in range(8):
+            if game.run_one_turn():
+                break
+
+        self.assertEqual(list(game.alive_players), [0])
+        self.assertNotIn(1, game.rule_abiding_players)
+
+    def test_time_bank_refills_every_game(self):
+        clients = [SlowConnection(PlayerClient(DummyConnection(), MockLogic(always_income, False, False, False)), 0)
+                   for _ in range(2)]
+        game = Game(clients, time_bank=3)
+        game.setup_players()
+        game.run_one_turn()
+        self.assertLess(game.all_players[0].time_bank, 3)
+        game.new_game()
+        game.setup_players()
+        self.assertEqual(game.all_players[0].time_bank, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
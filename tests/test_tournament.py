@@ -0,0 +1,27 @@
+import unittest
+from unittest import TestCase
+
+from game.tournament import run_tournament, _chunk_seed
+
+LOGICS = ["tests.mocks.random_logic:QuietRandomLogic"] * 3
+
+
+class TournamentTest(TestCase):
+    def test_results_are_merged(self):
+        result = run_tournament(LOGICS, 210, workers=2, seed=5, chunk_size=50)
+        self.assertEqual(result.games, 210)
+        self.assertEqual(sum(result.wins.values()), 210)
+        self.assertEqual(result.game_lengths.total(), 210)
+        self.assertGreaterEqual(result.actions.total(), result.game_lengths.total())
+
+    def test_seed_does_not_depend_on_workers(self):
+        one = run_tournament(LOGICS, 100, workers=1, seed=7, chunk_size=25)
+        two = run_tournament(LOGICS, 100, workers=2, seed=7, chunk_size=25)
+        self.assertEqual(one, two)
+
+    def test_unseeded_chunks_differ(self):
+        self.assertEqual(len({_chunk_seed(None, i) for i in range(10)}), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
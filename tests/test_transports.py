@@ -0,0 +1,173 @@
+import socket
+import threading
+import unittest
+from unittest import TestCase
+
+from connection.address import parse_address, connect
+from connection.channel import ChannelConnection
+from connection.sharedmemory import Ring, SharedMemoryConnection
+from game.gameclient import PlayerClient
+from game.gameserver import Game
+from game.messages.codec import BINARY, TEXT
+from game.messages.commands import AskName, AddOpponent
+from game.messages.responses import NameResponse
+from tests.mocks.mock_server import accept_in_background
+from tests.mocks.random_logic import RandomLogic
+
+
+class TransportsTest(TestCase):
+    def test_parse_address(self):
+        self.assertEqual(parse_address("tcp://localhost:5000"), ("tcp", ("localhost", 5000)))
+        self.assertEqual(parse_address("unix:///tmp/coup.sock"), ("unix", "/tmp/coup.sock"))
+        self.assertEqual(parse_address("unix://coup.sock"), ("unix", "coup.sock"))
+        self.assertEqual(parse_address("shm:///tmp/coup.sock"), ("shm", "/tmp/coup.sock"))
+        self.assertEqual(parse_address("mem://"), ("mem", None))
+        self.assertRaises(ValueError, parse_address, "tcp://localhost")
+        self.assertRaises(ValueError, parse_address, "udp://localhost:5000")
+
+    def test_game_over_channels(self):
+        connections, clients = [], []
+        for _ in range(3):
+            server_end, client_end = ChannelConnection.pair()
+            clients.append(threading.Thread(target=PlayerClient(client_end, RandomLogic(0)).run))
+            connections.append(server_end)
+        for c in clients:
+            c.start()
+        result = Game(connections).run_match(5)
+        for c in clients:
+            c.join(10)
+            self.assertFalse(c.is_alive())
+        self.assertEqual(result.games, 5)
+
+    def test_channel_timeout_and_close(self):
+        server_end, client_end = ChannelConnection.pair()
+        server_end.set_timeout(0.01)
+        self.assertRaises(TimeoutError, server_end.send_and_receive_response, AskName(), NameResponse)
+        client_end.close()
+        self.assertIsNone(server_end.send_and_receive_response(AskName(), NameResponse))
+
+    def test_game_over_unix_sockets(self):
+        address, accepting, accepted = accept_in_background(self, 2)
+        clients = [threading.Thread(target=lambda: PlayerClient(connect(address, codec=BINARY), RandomLogic(0)).run())
+                   for _ in range(2)]
+        for c in clients:
+            c.start()
+        accepting.join(10)
+
+        result = Game(accepted).run_match(5)
+        for c in clients:
+            c.join(10)
+            self.assertFalse(c.is_alive())
+        self.assertEqual(result.games, 5)
+        self.assertTrue(all(c.codec is BINARY for c in accepted))
+
+    def test_ring_wraps(self):
+        ring = Ring.create(64)
+        try:
+            for i in range(50):
+                frames = [bytes([i]) * (i % 20), b"x" * 10]
+                self.assertTrue(ring.write(frames))
+                for data in frames:
+                    self.assertTrue(ring.readable())
+                    start, end = ring.next_frame()
+                    self.assertEqual(bytes(ring.data[start:end]), data)
+                    ring.consume(end)
+                self.assertFalse(ring.readable())
+            # Full, and nothing is written then
+            self.assertTrue(ring.write([b"x" * 40]))
+            self.assertFalse(ring.write([b"y" * 20]))
+            self.assertRaises(ValueError, ring.write, [b"z" * 60])
+        finally:
+            ring.release()
+            ring.memory.unlink()
+
+    def test_game_over_shared_memory(self):
+        address, accepting, accepted = accept_in_background(self, 3, "shm")
+        clients = [threading.Thread(target=lambda codec=codec: PlayerClient(connect(address, codec=codec),
+                                                                            RandomLogic(0)).run())
+                   for codec in (TEXT, BINARY, BINARY)]
+        for c in clients:
+            c.start()
+        accepting.join(10)
+
+        result = Game(accepted).run_match(5)
+        for c in clients:
+            c.join(10)
+            self.assertFalse(c.is_alive())
+        self.assertEqual(result.games, 5)
+        self.assertEqual([c.codec for c in accepted].count(BINARY), 2)
+
+    def test_shared_memory_timeout_and_close(self):
+        address, accepting, accepted = accept_in_background(self, 1, "shm")
+        client = connect(address)
+        accepting.join(10)
+        server = accepted[0]
+
+        server.set_timeout(0.05)
+        self.assertRaises(TimeoutError, server.send_and_receive_response, AskName(), NameResponse)
+        self.assertIsInstance(client.receive_message(AskName), AskName)
+        # Messages sent before closing are still delivered
+        client.send(NameResponse("late"))
+        client.close()
+        self.assertEqual(server.receive_message(NameResponse).player_name, "late")
+        self.assertIsNone(server.send_and_receive_response(AddOpponent(1, "x"), NameResponse))
+        server.close()
+
+    def test_shared_memory_writer_waits_on_a_full_ring(self):
+        server_sock, client_sock = socket.socketpair()
+        rings = [Ring.create(64), Ring.create(64)]
+        server = SharedMemoryConnection(server_sock, rings[0], rings[1])
+        client = SharedMemoryConnection(client_sock, Ring.attach(rings[1].memory.name, 64),
+                                        Ring.attach(rings[0].memory.name, 64))
+        # A wakeup for the server's reader, which the waiting writer must leave alone
+        client_sock.send(b"\x00")
+        server.set_timeout(0.05)
+        with self.assertRaises(TimeoutError):
+            for _ in range(10):
+                server.send(NameResponse("full"))
+        self.assertEqual(server_sock.recv(1, socket.MSG_PEEK), b"\x00")
+        client.close()
+        self.assertRaises(BrokenPipeError, server.send, NameResponse("closed"))
+        server.close()
+        for ring in rings:
+            ring.memory.unlink()
+
+    def test_shared_memory_batch_larger_than_the_ring(self):
+        server_sock, client_sock = socket.socketpair()
+        rings = [Ring.create(64), Ring.create(64)]
+        server = SharedMemoryConnection(server_sock, rings[0], rings[1])
+        client = SharedMemoryConnection(client_sock, Ring.attach(rings[1].memory.name, 64),
+                                        Ring.attach(rings[0].memory.name, 64))
+        server.set_timeout(1)
+        received = []
+        reading = threading.Thread(target=lambda: received.extend(client.receive_message(NameResponse)
+                                                                  for _ in range(8)), daemon=True)
+        reading.start()
+        server.send_many([NameResponse(str(i)) for i in range(8)])
+        reading.join(5)
+        self.assertEqual([r.player_name for r in received], [str(i) for i in range(8)])
+        client.close()
+        server.close()
+        for ring in rings:
+            ring.memory.unlink()
+
+    def test_bad_shared_memory_clients_are_skipped(self):
+        address, accepting, accepted = accept_in_background(self, 1, "shm", 0.2)
+        # An unknown codec, one that leaves at once, and one that never sends a hello
+        bad = [socket.socket(socket.AF_UNIX) for _ in range(3)]
+        for s in bad:
+            s.connect(parse_address(address)[1])
+        bad[0].sendall(b"\x00BAD")
+        bad[1].close()
+        client = connect(address)
+        accepting.join(5)
+        self.assertFalse(accepting.is_alive())
+        self.assertEqual(len(accepted), 1)
+        client.send(NameResponse("good"))
+        self.assertEqual(accepted[0].receive_message(NameResponse).player_name, "good")
+        for c in accepted + [client] + bad:
+            c.close()
+
+
+if __name__ == '__main__':
+    unittest.main()